@@ -35,6 +35,20 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+# Session limits for online migrations, so a migration stuck behind (or
+# holding) a lock fails fast instead of stalling app traffic. They are sent
+# as connection startup parameters, which makes them the session defaults:
+# long-running steps (CONCURRENTLY index builds, VALIDATE CONSTRAINT,
+# batched backfills) run in autocommit blocks that start with
+# "SET statement_timeout = 0" and end with "RESET statement_timeout", which
+# restores the value below. A cancelled CONCURRENTLY build would leave an
+# INVALID index that later IF NOT EXISTS checks silently skip.
+MIGRATION_SESSION_SETTINGS = {
+    "lock_timeout": os.getenv("MIGRATION_LOCK_TIMEOUT", "3s"),
+    "statement_timeout": os.getenv("MIGRATION_STATEMENT_TIMEOUT", "5min"),
+}
+
+
 def get_url():
     """Get database URL from environment or config."""
     # Try to get from environment first (for Docker) or fallback to config
@@ -93,6 +107,7 @@ async def run_async_migrations() -> None:
         configuration,
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
+        connect_args={"server_settings": MIGRATION_SESSION_SETTINGS},
     )
 
     async with connectable.connect() as connection:
@@ -17,8 +17,10 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Add streak_freezers to users (default 0, not null)
-    op.add_column('users', sa.Column('streak_freezers', sa.Integer(), nullable=False, server_default='0'))
+    # Add streak_freezers to users (default 0, not null).
+    # The default must stay a constant: on PG11+ that makes this a
+    # metadata-only ADD COLUMN ... DEFAULT 0 NOT NULL with no table rewrite.
+    op.add_column('users', sa.Column('streak_freezers', sa.Integer(), nullable=False, server_default=sa.text('0')))
     # Optionally, remove from habits if it exists:
     # with op.batch_alter_table('habits') as batch_op:
     #     batch_op.drop_column('streak_freezers')
@@ -0,0 +1,46 @@
+"""Order the conversation message index newest-first
+
+Revision ID: 2ace2b0bf39a
+Revises: 3446d538f6aa
+Create Date: 2025-07-24 13:30:00.000000
+
+idx_message_conversation_created_desc on (conversation_id, created_at
+DESC) matches the ORDER BY created_at DESC LIMIT n of
+get_conversation_messages. It replaces the ascending
+idx_message_conversation_created; keeping both would double the write
+cost on every message insert.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2ace2b0bf39a'
+down_revision = '3446d538f6aa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build the replacement before dropping the old index, both CONCURRENTLY
+    # so messages can still be sent meanwhile
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        op.create_index('idx_message_conversation_created_desc', 'messages',
+                        ['conversation_id', sa.text('created_at DESC')],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('idx_message_conversation_created', table_name='messages',
+                      postgresql_concurrently=True, if_exists=True)
+        op.execute("RESET statement_timeout")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("SET statement_timeout = 0")
+        op.create_index('idx_message_conversation_created', 'messages', ['conversation_id', 'created_at'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('idx_message_conversation_created_desc', table_name='messages',
+                      postgresql_concurrently=True, if_exists=True)
+        op.execute("RESET statement_timeout")
@@ -0,0 +1,46 @@
+"""Replace idx_participant_unread with a partial index on positive counts
+
+Revision ID: 3446d538f6aa
+Revises: 5d3c6547e48b
+Create Date: 2025-07-24 13:20:00.000000
+
+The full btree on unread_count indexes every participant, though almost
+all of them sit at zero. idx_participant_unread_positive on
+(user_id, unread_count) WHERE unread_count > 0 covers per-user badge
+lookups, and resetting a counter to zero just removes the row from the
+index.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3446d538f6aa'
+down_revision = '5d3c6547e48b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build the replacement before dropping the old index, both CONCURRENTLY
+    # so new messages and read receipts continue meanwhile
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        op.create_index('idx_participant_unread_positive', 'conversation_participants', ['user_id', 'unread_count'],
+                        postgresql_where=sa.text('unread_count > 0'),
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('idx_participant_unread', table_name='conversation_participants',
+                      postgresql_concurrently=True, if_exists=True)
+        op.execute("RESET statement_timeout")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("SET statement_timeout = 0")
+        op.create_index('idx_participant_unread', 'conversation_participants', ['unread_count'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('idx_participant_unread_positive', table_name='conversation_participants',
+                      postgresql_concurrently=True, if_exists=True)
+        op.execute("RESET statement_timeout")
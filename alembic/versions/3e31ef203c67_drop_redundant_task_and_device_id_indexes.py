@@ -0,0 +1,41 @@
+"""Drop ix_*_id indexes on device_tokens and the task tables
+
+Revision ID: 3e31ef203c67
+Revises: d400a66652c8
+Create Date: 2025-07-24 14:00:00.000000
+
+Same as d400a66652c8, for the indexes 5e1819758e86 and 363101ac576a
+used to create next to the primary key.
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3e31ef203c67'
+down_revision = 'd400a66652c8'
+branch_labels = None
+depends_on = None
+
+
+ID_INDEXES = [
+    ('ix_device_tokens_id', 'device_tokens'),
+    ('ix_task_entries_id', 'task_entries'),
+    ('ix_task_validations_id', 'task_validations'),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY so the tables stay writable while the indexes go
+    with op.get_context().autocommit_block():
+        for name, table in ID_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        for name, table in ID_INDEXES:
+            op.create_index(name, table, ['id'], postgresql_concurrently=True, if_not_exists=True)
+        op.execute("RESET statement_timeout")
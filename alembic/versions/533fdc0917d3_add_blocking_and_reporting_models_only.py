@@ -5,6 +5,8 @@ Revises: 5400f34e1c5d
 Create Date: 2025-07-02 17:52:12.969329
 
 """
+import os
+
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
@@ -15,57 +17,72 @@ down_revision = '5400f34e1c5d'
 branch_labels = None
 depends_on = None
 
+# When set, indexes and unique constraints are left to the
+# build_deferred_indexes revision so bulk loads don't maintain them.
+DEFER_INDEXES = os.getenv('ALEMBIC_DEFER_INDEXES', 'false').lower() == 'true'
+
 
 def upgrade() -> None:
+    # Unique constraints and indexes are declared on the tables themselves
+    # so they are emitted together with CREATE TABLE, on the still-empty tables.
+    blocked_user_indexes = [] if DEFER_INDEXES else [
+        # The unique index also serves blocker_id-only lookups
+        sa.UniqueConstraint('blocker_id', 'blocked_id', name='unique_blocked_user'),
+        sa.Index('idx_blocked_user_blocked_id', 'blocked_id', postgresql_include=['blocker_id']),
+    ]
+    # Composite indexes matching the actual report queries; each serves its
+    # filter plus the ORDER BY created_at (scanned backwards for DESC)
+    user_report_indexes = [] if DEFER_INDEXES else [
+        sa.Index('idx_user_report_reporter_reported', 'reporter_id', 'reported_id'),
+        sa.Index('idx_user_report_reported_created', 'reported_id', 'created_at'),
+        sa.Index('idx_user_report_moderation', 'status', 'created_at'),
+    ]
+
+    # The app's create_all may have created either table already
+    inspector = sa.inspect(op.get_bind())
+
     # Create blocked_users table
-    op.create_table('blocked_users',
-        sa.Column('id', sa.Integer(), nullable=False),
-        sa.Column('blocker_id', sa.Integer(), nullable=False),
-        sa.Column('blocked_id', sa.Integer(), nullable=False),
-        sa.Column('reason', sa.String(), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
-        sa.ForeignKeyConstraint(['blocked_id'], ['users.id'], ondelete='CASCADE'),
-        sa.ForeignKeyConstraint(['blocker_id'], ['users.id'], ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('id'),
-        sa.UniqueConstraint('blocker_id', 'blocked_id', name='unique_blocked_user')
-    )
-    op.create_index('idx_blocked_user_blocker_id', 'blocked_users', ['blocker_id'], unique=False)
-    op.create_index('idx_blocked_user_blocked_id', 'blocked_users', ['blocked_id'], unique=False)
+    if not inspector.has_table('blocked_users'):
+        op.create_table('blocked_users',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('blocker_id', sa.Integer(), nullable=False),
+            sa.Column('blocked_id', sa.Integer(), nullable=False),
+            sa.Column('reason', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+            sa.ForeignKeyConstraint(['blocked_id'], ['users.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['blocker_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+            *blocked_user_indexes
+        )
 
     # Create user_reports table
-    op.create_table('user_reports',
-        sa.Column('id', sa.Integer(), nullable=False),
-        sa.Column('reporter_id', sa.Integer(), nullable=False),
-        sa.Column('reported_id', sa.Integer(), nullable=False),
-        sa.Column('category', sa.String(), nullable=False),
-        sa.Column('description', sa.String(), nullable=True),
-        sa.Column('status', sa.String(), nullable=False, server_default='pending'),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
-        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
-        sa.Column('reviewed_at', sa.DateTime(timezone=True), nullable=True),
-        sa.Column('reviewed_by', sa.Integer(), nullable=True),
-        sa.ForeignKeyConstraint(['reported_id'], ['users.id'], ondelete='CASCADE'),
-        sa.ForeignKeyConstraint(['reporter_id'], ['users.id'], ondelete='CASCADE'),
-        sa.ForeignKeyConstraint(['reviewed_by'], ['users.id'], ondelete='SET NULL'),
-        sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index('idx_user_report_reporter_id', 'user_reports', ['reporter_id'], unique=False)
-    op.create_index('idx_user_report_reported_id', 'user_reports', ['reported_id'], unique=False)
-    op.create_index('idx_user_report_status', 'user_reports', ['status'], unique=False)
-    op.create_index('idx_user_report_category', 'user_reports', ['category'], unique=False)
-    op.create_index('idx_user_report_created_at', 'user_reports', ['created_at'], unique=False)
+    if not inspector.has_table('user_reports'):
+        op.create_table('user_reports',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('reporter_id', sa.Integer(), nullable=False),
+            sa.Column('reported_id', sa.Integer(), nullable=False),
+            sa.Column('category', sa.String(), nullable=False),
+            sa.Column('description', sa.String(), nullable=True),
+            sa.Column('status', sa.String(), nullable=False, server_default='pending'),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('reviewed_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('reviewed_by', sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(['reported_id'], ['users.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['reporter_id'], ['users.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['reviewed_by'], ['users.id'], ondelete='SET NULL'),
+            sa.PrimaryKeyConstraint('id'),
+            *user_report_indexes
+        )
 
 
 def downgrade() -> None:
     # Drop user_reports table
-    op.drop_index('idx_user_report_created_at', table_name='user_reports')
-    op.drop_index('idx_user_report_category', table_name='user_reports')
-    op.drop_index('idx_user_report_status', table_name='user_reports')
-    op.drop_index('idx_user_report_reported_id', table_name='user_reports')
-    op.drop_index('idx_user_report_reporter_id', table_name='user_reports')
-    op.drop_table('user_reports')
+    op.drop_index('idx_user_report_moderation', table_name='user_reports', if_exists=True)
+    op.drop_index('idx_user_report_reported_created', table_name='user_reports', if_exists=True)
+    op.drop_index('idx_user_report_reporter_reported', table_name='user_reports', if_exists=True)
+    op.execute("DROP TABLE IF EXISTS user_reports")
 
     # Drop blocked_users table
-    op.drop_index('idx_blocked_user_blocked_id', table_name='blocked_users')
-    op.drop_index('idx_blocked_user_blocker_id', table_name='blocked_users')
-    op.drop_table('blocked_users')
\ No newline at end of file
+    op.drop_index('idx_blocked_user_blocked_id', table_name='blocked_users', if_exists=True)
+    op.execute("DROP TABLE IF EXISTS blocked_users")
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""Replace idx_participant_online with a partial index on online users
+
+Revision ID: 5d3c6547e48b
+Revises: 6ef9a2907cb4
+Create Date: 2025-07-24 13:10:00.000000
+
+A btree on the two-valued is_online column has almost no selectivity,
+and it is updated on every connect and disconnect.
+idx_participant_online_true indexes user_id for the online rows only, so
+presence flips to offline and the common is_online = false case skip
+index maintenance.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d3c6547e48b'
+down_revision = '6ef9a2907cb4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build the replacement before dropping the old index, both CONCURRENTLY
+    # so presence updates continue meanwhile
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        op.create_index('idx_participant_online_true', 'conversation_participants', ['user_id'],
+                        postgresql_where=sa.text('is_online = true'),
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('idx_participant_online', table_name='conversation_participants',
+                      postgresql_concurrently=True, if_exists=True)
+        op.execute("RESET statement_timeout")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("SET statement_timeout = 0")
+        op.create_index('idx_participant_online', 'conversation_participants', ['is_online'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('idx_participant_online_true', table_name='conversation_participants',
+                      postgresql_concurrently=True, if_exists=True)
+        op.execute("RESET statement_timeout")
@@ -48,7 +48,6 @@ def upgrade() -> None:
     sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
     sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_task_entries_id'), 'task_entries', ['id'], unique=False)
     op.create_table('task_validations',
     sa.Column('id', sa.Integer(), nullable=False),
     sa.Column('task_entry_id', sa.Integer(), nullable=False),
@@ -63,54 +62,66 @@ def upgrade() -> None:
     sa.ForeignKeyConstraint(['task_entry_id'], ['task_entries.id'], ),
     sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_task_validations_id'), 'task_validations', ['id'], unique=False)
-    op.add_column('ability_entries', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
-    op.alter_column('ability_entries', 'level',
-               existing_type=postgresql.ENUM('cant_do', 'hard', 'easy', name='abilitylevel'),
-               type_=sa.String(),
-               existing_nullable=False)
-    op.drop_constraint('ability_entries_user_id_fkey', 'ability_entries', type_='foreignkey')
-    op.add_column('habits', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
-    op.add_column('habits', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
-    op.alter_column('habits', 'description',
-               existing_type=sa.VARCHAR(),
-               type_=sa.Text(),
-               existing_nullable=True)
-    op.drop_constraint('habits_user_id_fkey', 'habits', type_='foreignkey')
-    op.create_foreign_key(None, 'habits', 'users', ['user_id'], ['id'])
-    op.add_column('motivation_entries', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
-    op.alter_column('motivation_entries', 'level',
-               existing_type=postgresql.ENUM('low', 'medium', 'high', name='motivationlevel'),
-               type_=sa.String(),
-               existing_nullable=False)
-    op.drop_constraint('motivation_entries_user_id_fkey', 'motivation_entries', type_='foreignkey')
+    # One ALTER TABLE per table so each is locked (and rewritten) at most once
+    op.execute("""
+        ALTER TABLE ability_entries
+            ADD COLUMN created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            ALTER COLUMN level TYPE VARCHAR USING level::text,
+            DROP CONSTRAINT ability_entries_user_id_fkey
+    """)
+    op.execute("""
+        ALTER TABLE habits
+            ADD COLUMN created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            ADD COLUMN updated_at TIMESTAMP WITH TIME ZONE,
+            ALTER COLUMN description TYPE TEXT,
+            DROP CONSTRAINT habits_user_id_fkey,
+            ADD CONSTRAINT habits_user_id_fkey FOREIGN KEY (user_id) REFERENCES users(id) NOT VALID
+    """)
+    op.execute("""
+        ALTER TABLE motivation_entries
+            ADD COLUMN created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            ALTER COLUMN level TYPE VARCHAR USING level::text,
+            DROP CONSTRAINT motivation_entries_user_id_fkey
+    """)
+    # level is plain VARCHAR now, so the enum types are unused
+    op.execute("DROP TYPE IF EXISTS abilitylevel")
+    op.execute("DROP TYPE IF EXISTS motivationlevel")
+    # The FK was added NOT VALID to skip the scan under the ALTER TABLE lock;
+    # validate existing rows separately, holding only ShareUpdateExclusiveLock.
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        op.execute("ALTER TABLE habits VALIDATE CONSTRAINT habits_user_id_fkey")
+        op.execute("RESET statement_timeout")
     # ### end Alembic commands ###
 
 
 def downgrade() -> None:
     # ### commands auto generated by Alembic - please adjust! ###
-    op.create_foreign_key('motivation_entries_user_id_fkey', 'motivation_entries', 'users', ['user_id'], ['clerk_id'])
-    op.alter_column('motivation_entries', 'level',
-               existing_type=sa.String(),
-               type_=postgresql.ENUM('low', 'medium', 'high', name='motivationlevel'),
-               existing_nullable=False)
-    op.drop_column('motivation_entries', 'created_at')
-    op.drop_constraint(None, 'habits', type_='foreignkey')
-    op.create_foreign_key('habits_user_id_fkey', 'habits', 'users', ['user_id'], ['id'], ondelete='CASCADE')
-    op.alter_column('habits', 'description',
-               existing_type=sa.Text(),
-               type_=sa.VARCHAR(),
-               existing_nullable=True)
-    op.drop_column('habits', 'updated_at')
-    op.drop_column('habits', 'created_at')
-    op.create_foreign_key('ability_entries_user_id_fkey', 'ability_entries', 'users', ['user_id'], ['clerk_id'])
-    op.alter_column('ability_entries', 'level',
-               existing_type=sa.String(),
-               type_=postgresql.ENUM('cant_do', 'hard', 'easy', name='abilitylevel'),
-               existing_nullable=False)
-    op.drop_column('ability_entries', 'created_at')
-    op.drop_index(op.f('ix_task_validations_id'), table_name='task_validations')
+    # The upgrade drops these types only if they exist, so recreate them the same way
+    bind = op.get_bind()
+    postgresql.ENUM('cant_do', 'hard', 'easy', name='abilitylevel').create(bind, checkfirst=True)
+    postgresql.ENUM('low', 'medium', 'high', name='motivationlevel').create(bind, checkfirst=True)
+    op.execute("""
+        ALTER TABLE motivation_entries
+            ADD CONSTRAINT motivation_entries_user_id_fkey FOREIGN KEY (user_id) REFERENCES users(clerk_id),
+            ALTER COLUMN level TYPE motivationlevel USING level::motivationlevel,
+            DROP COLUMN created_at
+    """)
+    op.execute("""
+        ALTER TABLE habits
+            DROP CONSTRAINT habits_user_id_fkey,
+            ADD CONSTRAINT habits_user_id_fkey FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            ALTER COLUMN description TYPE VARCHAR,
+            DROP COLUMN updated_at,
+            DROP COLUMN created_at
+    """)
+    op.execute("""
+        ALTER TABLE ability_entries
+            ADD CONSTRAINT ability_entries_user_id_fkey FOREIGN KEY (user_id) REFERENCES users(clerk_id),
+            ALTER COLUMN level TYPE abilitylevel USING level::abilitylevel,
+            DROP COLUMN created_at
+    """)
     op.drop_table('task_validations')
-    op.drop_index(op.f('ix_task_entries_id'), table_name='task_entries')
     op.drop_table('task_entries')
     # ### end Alembic commands ###
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""Index unindexed foreign-key columns on chat and support tables
+
+Revision ID: 6ef9a2907cb4
+Revises: e5c7a9d3b4f2
+Create Date: 2025-07-24 13:00:00.000000
+
+PostgreSQL does not index FK child columns automatically, so parent
+deletes and joins on these columns fell back to sequential scans.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6ef9a2907cb4'
+down_revision = 'e5c7a9d3b4f2'
+branch_labels = None
+depends_on = None
+
+# (index name, table, column)
+FK_INDEXES = [
+    # Keeps message deletes from scanning participants
+    ('idx_participant_last_read_message', 'conversation_participants', 'last_read_message_id'),
+    ('idx_support_requests_assigned_to', 'support_requests', 'assigned_to'),
+    ('idx_support_responses_support_request_id', 'support_responses', 'support_request_id'),
+    ('idx_support_responses_bug_report_id', 'support_responses', 'bug_report_id'),
+    ('idx_support_responses_responder', 'support_responses', 'responder_id'),
+]
+
+
+def upgrade() -> None:
+    # Built CONCURRENTLY so chat and support writes continue meanwhile
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        for name, table, column in FK_INDEXES:
+            op.create_index(name, table, [column],
+                            postgresql_concurrently=True, if_not_exists=True)
+        op.execute("RESET statement_timeout")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(FK_INDEXES):
+            op.drop_index(name, table_name=table,
+                          postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,71 @@
+"""Build indexes deferred by ALEMBIC_DEFER_INDEXES
+
+Revision ID: 7c4e2d9b1a03
+Revises: cf3d5b0ff921
+Create Date: 2025-07-20 12:00:00.000000
+
+Running the earlier migrations with ALEMBIC_DEFER_INDEXES=true creates
+close_friends, blocked_users, user_reports and device_tokens without their
+indexes so a bulk load doesn't have to maintain them row by row. Load the
+data, then upgrade to this revision to build everything CONCURRENTLY.
+On a normal run every index already exists and this is a no-op.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c4e2d9b1a03'
+down_revision = 'cf3d5b0ff921'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns, unique, extra create_index kwargs)
+DEFERRED_INDEXES = [
+    ('idx_close_friend_user_id', 'close_friends', ['user_id'], False, {}),
+    ('idx_close_friend_close_friend_id', 'close_friends', ['close_friend_id'], False, {}),
+    ('idx_blocked_user_blocked_id', 'blocked_users', ['blocked_id'], False, {'postgresql_include': ['blocker_id']}),
+    ('idx_user_report_reporter_reported', 'user_reports', ['reporter_id', 'reported_id'], False, {}),
+    ('idx_user_report_reported_created', 'user_reports', ['reported_id', 'created_at'], False, {}),
+    ('idx_user_report_moderation', 'user_reports', ['status', 'created_at'], False, {}),
+    ('ix_device_tokens_device_token', 'device_tokens', ['device_token'], True, {}),
+]
+
+# (constraint name, table, columns)
+DEFERRED_UNIQUE_CONSTRAINTS = [
+    ('unique_close_friend', 'close_friends', ['user_id', 'close_friend_id']),
+    ('unique_blocked_user', 'blocked_users', ['blocker_id', 'blocked_id']),
+    ('uq_user_device_token', 'device_tokens', ['user_id', 'device_token']),
+]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    existing_constraints = set(conn.execute(
+        sa.text("SELECT conname FROM pg_constraint WHERE conname = ANY(:names)"),
+        {"names": [name for name, _, _ in DEFERRED_UNIQUE_CONSTRAINTS]},
+    ).scalars())
+
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        for name, table, columns, unique, kw in DEFERRED_INDEXES:
+            op.create_index(name, table, columns, unique=unique,
+                            postgresql_concurrently=True, if_not_exists=True, **kw)
+
+        # Build the backing unique index without an exclusive lock, then
+        # attach it as the constraint (a brief catalog-only change).
+        for name, table, columns in DEFERRED_UNIQUE_CONSTRAINTS:
+            if name in existing_constraints:
+                continue
+            op.create_index(name, table, columns, unique=True,
+                            postgresql_concurrently=True, if_not_exists=True)
+            op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}")
+        op.execute("RESET statement_timeout")
+
+
+def downgrade() -> None:
+    # The indexes belong to the revisions that declare them and are
+    # dropped when those revisions are downgraded.
+    pass
@@ -18,15 +18,29 @@ depends_on = None
 
 def upgrade() -> None:
     # Add habit_streak column to posts table
-    op.add_column('posts', sa.Column('habit_streak', sa.Integer(), nullable=True))
+    op.execute("ALTER TABLE posts ADD COLUMN IF NOT EXISTS habit_streak INTEGER")
 
-    # Add index for habit_streak column for better performance
-    op.create_index('idx_post_habit_streak', 'posts', ['habit_streak'])
+    # Add index for habit_streak column for better performance.
+    # Partial: most posts carry no streak, so only positive streaks are
+    # indexed. posts already holds data, so build it CONCURRENTLY (outside
+    # the migration transaction) to avoid blocking writes during the build.
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        op.create_index('idx_post_habit_streak', 'posts', ['habit_streak'],
+                        postgresql_where=sa.text('habit_streak > 0'),
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.execute("RESET statement_timeout")
 
 
 def downgrade() -> None:
     # Drop index first
-    op.drop_index('idx_post_habit_streak', table_name='posts')
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        op.drop_index('idx_post_habit_streak', table_name='posts',
+                      postgresql_concurrently=True, if_exists=True)
+        op.execute("RESET statement_timeout")
 
     # Drop the habit_streak column
-    op.drop_column('posts', 'habit_streak')
\ No newline at end of file
+    op.execute("ALTER TABLE posts DROP COLUMN IF EXISTS habit_streak")
\ No newline at end of file
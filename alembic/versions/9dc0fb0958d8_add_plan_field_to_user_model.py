@@ -17,7 +17,9 @@ depends_on = None
 
 
 def upgrade() -> None:
-    op.add_column('users', sa.Column('plan', sa.String(), nullable=False, server_default='free'))
+    # Constant default keeps this a metadata-only ADD COLUMN on PG11+ (no
+    # rewrite of users); don't swap it for a volatile expression.
+    op.add_column('users', sa.Column('plan', sa.String(), nullable=False, server_default=sa.text("'free'")))
 
 def downgrade() -> None:
     op.drop_column('users', 'plan')
\ No newline at end of file
@@ -5,6 +5,8 @@ Revises: 9d8f61174665
 Create Date: 2025-06-21 20:29:06.001013
 
 """
+import os
+
 from alembic import op
 import sqlalchemy as sa
 
@@ -15,20 +17,57 @@ down_revision = '9d8f61174665'
 branch_labels = None
 depends_on = None
 
+# Column order in PostgreSQL is cosmetic, so by default the users table is
+# brought to the target shape in place. Set REORDER_USERS_PHYSICAL=true to
+# rebuild it with the new physical column order instead (copies every row).
+REORDER_USERS_PHYSICAL = os.getenv('REORDER_USERS_PHYSICAL', 'false').lower() == 'true'
+
+# Rows copied per transaction when rebuilding users physically
+COPY_CHUNK_SIZE = 10_000
+
+# Columns of the rebuilt table; the in-place path drops any others, as the
+# rebuild does (later revisions add plan, profile_image_url, bio etc. again)
+USERS_COLUMNS = ('id', 'clerk_id', 'email', 'username', 'is_active', 'created_at', 'updated_at')
+
 
 def upgrade() -> None:
-    # WARNING: This migration drops and recreates the users table. Make sure the schema matches your current models and no data is lost.
     conn = op.get_bind()
+    # Serialise concurrent alembic runs on this revision. Session-level rather
+    # than pg_advisory_xact_lock so it survives the commits of the autocommit
+    # blocks below, which is why it must be released explicitly.
+    conn.execute(sa.text("SELECT pg_advisory_lock(hashtext('alembic_a3c21557cf1d'))"))
+    try:
+        reshape_users(conn)
+    finally:
+        try:
+            conn.execute(sa.text("SELECT pg_advisory_unlock(hashtext('alembic_a3c21557cf1d'))"))
+        except sa.exc.DBAPIError:
+            # A failed statement left the migration transaction aborted, so
+            # the unlock is refused; closing the connection releases the lock
+            # (env.py uses NullPool, so it is not returned to a pool)
+            pass
+
+
+def reshape_users(conn) -> None:
+    # Both existence checks in one round-trip against pg_catalog, which is
+    # far cheaper than the information_schema views
+    existing = conn.execute(sa.text("""
+        SELECT
+            EXISTS(SELECT 1 FROM pg_class WHERE relname = 'users' AND relkind = 'r') AS users_exists,
+            EXISTS(SELECT 1 FROM pg_constraint WHERE conname = 'onboarding_progress_user_id_fkey') AS fk_exists
+    """)).one()
+    users_exists = existing.users_exists
+
+    if not REORDER_USERS_PHYSICAL:
+        if users_exists:
+            reshape_users_in_place(conn)
+        return
+
+    # WARNING: This path drops and recreates the users table. Make sure the schema matches your current models and no data is lost.
     # Drop the foreign key constraint only if it exists
-    fk_exists = conn.execute(
-        sa.text("SELECT 1 FROM information_schema.table_constraints WHERE table_name='onboarding_progress' AND constraint_name='onboarding_progress_user_id_fkey'")
-    ).scalar()
-    if fk_exists:
+    if existing.fk_exists:
         op.execute("ALTER TABLE onboarding_progress DROP CONSTRAINT onboarding_progress_user_id_fkey")
     # Only create users_new if users exists
-    users_exists = conn.execute(
-        sa.text("SELECT 1 FROM information_schema.tables WHERE table_name='users'")
-    ).scalar()
     if users_exists:
         op.execute("""
             CREATE TABLE users_new (
@@ -41,11 +80,7 @@ def upgrade() -> None:
                 updated_at TIMESTAMP WITH TIME ZONE
             )
         """)
-        op.execute("""
-            INSERT INTO users_new (id, clerk_id, email, username, is_active, created_at, updated_at)
-            SELECT id, clerk_id, email, username, is_active, created_at, updated_at
-            FROM users
-        """)
+        copy_users_in_chunks(conn)
         op.execute("DROP TABLE users")
         op.execute("ALTER TABLE users_new RENAME TO users")
         op.execute("CREATE INDEX ix_users_clerk_id ON users (clerk_id)")
@@ -59,7 +94,82 @@ def upgrade() -> None:
     """)
 
 
+def copy_users_in_chunks(conn) -> None:
+    """Copy users into users_new in id ranges, committing after each one.
+
+    Keeps every transaction short so autovacuum and other sessions are not
+    held up behind a single table-sized INSERT ... SELECT.
+    """
+    max_id = conn.execute(sa.text("SELECT COALESCE(MAX(id), 0) FROM users")).scalar()
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        for lo in range(0, max_id + 1, COPY_CHUNK_SIZE):
+            conn.execute(
+                sa.text("""
+                    INSERT INTO users_new (id, clerk_id, email, username, is_active, created_at, updated_at)
+                    SELECT id, clerk_id, email, username, is_active, created_at, updated_at
+                    FROM users
+                    WHERE id >= :lo AND id < :hi
+                """),
+                {"lo": lo, "hi": lo + COPY_CHUNK_SIZE},
+            )
+        op.execute("RESET statement_timeout")
+
+
+def reshape_users_in_place(conn) -> None:
+    """Give users the columns, constraints, defaults and indexes of the
+    rebuilt table.
+
+    Like the rebuild, this drops every column outside USERS_COLUMNS and
+    every unique constraint, since later revisions add them again. Every
+    clause is a catalog-only change (DROP COLUMN, DROP CONSTRAINT, widening
+    VARCHAR(n) to VARCHAR, nullability and defaults), so no rows are copied
+    and the ACCESS EXCLUSIVE lock is held only briefly. Missing indexes are
+    built CONCURRENTLY, so writers are never blocked behind an index build.
+    """
+    # Both lookups in one round-trip against pg_catalog
+    extra = conn.execute(sa.text("""
+        SELECT
+            ARRAY(SELECT attname FROM pg_attribute
+                  WHERE attrelid = 'users'::regclass AND attnum > 0 AND NOT attisdropped
+                    AND attname <> ALL(:keep)
+                  ORDER BY attnum) AS columns,
+            ARRAY(SELECT conname FROM pg_constraint
+                  WHERE conrelid = 'users'::regclass AND contype = 'u'
+                  ORDER BY conname) AS unique_constraints
+    """), {"keep": list(USERS_COLUMNS)}).one()
+
+    clauses = [f"DROP CONSTRAINT {name}" for name in extra.unique_constraints]
+    clauses += [f"DROP COLUMN {name}" for name in extra.columns]
+    clauses += [
+        "ALTER COLUMN clerk_id TYPE VARCHAR",
+        "ALTER COLUMN email TYPE VARCHAR",
+        "ALTER COLUMN username TYPE VARCHAR",
+        "ALTER COLUMN username DROP NOT NULL",
+        "ALTER COLUMN is_active DROP NOT NULL",
+        "ALTER COLUMN is_active SET DEFAULT true",
+        "ALTER COLUMN created_at DROP NOT NULL",
+        "ALTER COLUMN created_at SET DEFAULT now()",
+        "ALTER COLUMN updated_at DROP NOT NULL",
+        "ALTER COLUMN updated_at DROP DEFAULT",
+    ]
+    op.execute("ALTER TABLE users " + ", ".join(clauses))
+
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        for column in ('clerk_id', 'email', 'id'):
+            op.create_index(f'ix_users_{column}', 'users', [column],
+                            postgresql_concurrently=True, if_not_exists=True)
+        op.execute("RESET statement_timeout")
+
+
 def downgrade() -> None:
+    if not REORDER_USERS_PHYSICAL:
+        # Nothing was reordered on the way up
+        return
+
     # Revert to original column order: id, clerk_id, username, is_active, created_at, updated_at, email
 
     # Drop the foreign key constraint
@@ -23,16 +23,13 @@ def upgrade() -> None:
         sa.Column('id', sa.Integer(), nullable=False),
         sa.Column('participant_1_id', sa.Integer(), nullable=False),
         sa.Column('participant_2_id', sa.Integer(), nullable=False),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
-        sa.Column('last_message_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('last_message_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
         sa.ForeignKeyConstraint(['participant_1_id'], ['users.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['participant_2_id'], ['users.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index('idx_conversation_participants', 'conversations', ['participant_1_id', 'participant_2_id'])
-    op.create_index('idx_conversation_last_message', 'conversations', ['last_message_at'])
-    op.create_index('ix_conversations_id', 'conversations', ['id'])
 
     # Create messages table
     op.create_table(
@@ -43,17 +40,13 @@ def upgrade() -> None:
         sa.Column('content', sa.Text(), nullable=False),
         sa.Column('message_type', sa.String(), nullable=False, server_default='text'),
         sa.Column('status', sa.String(), nullable=False, server_default='sent'),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
         sa.Column('delivered_at', sa.DateTime(timezone=True), nullable=True),
         sa.Column('read_at', sa.DateTime(timezone=True), nullable=True),
         sa.ForeignKeyConstraint(['conversation_id'], ['conversations.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['sender_id'], ['users.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index('idx_message_conversation_created', 'messages', ['conversation_id', 'created_at'])
-    op.create_index('idx_message_sender', 'messages', ['sender_id'])
-    op.create_index('idx_message_status', 'messages', ['status'])
-    op.create_index('ix_messages_id', 'messages', ['id'])
 
     # Create conversation_participants table
     op.create_table(
@@ -65,17 +58,36 @@ def upgrade() -> None:
         sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True),
         sa.Column('last_read_message_id', sa.Integer(), nullable=True),
         sa.Column('unread_count', sa.Integer(), nullable=True, server_default='0'),
-        sa.Column('joined_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('joined_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
         sa.ForeignKeyConstraint(['conversation_id'], ['conversations.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['last_read_message_id'], ['messages.id']),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index('idx_participant_conversation_user', 'conversation_participants', ['conversation_id', 'user_id'])
-    op.create_index('idx_participant_online', 'conversation_participants', ['is_online'])
-    op.create_index('idx_participant_unread', 'conversation_participants', ['unread_count'])
-    op.create_index('ix_conversation_participants_id', 'conversation_participants', ['id'])
+
+    # Secondary indexes are built CONCURRENTLY outside the migration
+    # transaction, so a re-run against live tables never blocks writers
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        op.create_index('idx_conversation_participants', 'conversations', ['participant_1_id', 'participant_2_id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_conversation_last_message', 'conversations', ['last_message_at'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_message_conversation_created', 'messages', ['conversation_id', 'created_at'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_message_sender', 'messages', ['sender_id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_message_status', 'messages', ['status'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_participant_conversation_user', 'conversation_participants', ['conversation_id', 'user_id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_participant_online', 'conversation_participants', ['is_online'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_participant_unread', 'conversation_participants', ['unread_count'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.execute("RESET statement_timeout")
 
 
 def downgrade() -> None:
@@ -30,12 +30,12 @@ def upgrade() -> None:
     )
 
     # Add index for better performance
-    op.create_index('idx_message_replied_to', 'messages', ['replied_to_message_id'])
+    op.create_index('idx_message_replied_to', 'messages', ['replied_to_message_id'], if_not_exists=True)
 
 
 def downgrade() -> None:
     # Remove index
-    op.drop_index('idx_message_replied_to', table_name='messages')
+    op.drop_index('idx_message_replied_to', table_name='messages', if_exists=True)
 
     # Remove foreign key constraint
     op.drop_constraint('fk_messages_replied_to_message_id', 'messages', type_='foreignkey')
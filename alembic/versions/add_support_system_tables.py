@@ -27,7 +27,7 @@ def upgrade() -> None:
         sa.Column('status', sa.String(length=20), nullable=True),
         sa.Column('priority', sa.String(length=20), nullable=True),
         sa.Column('system_info', postgresql.JSON(astext_type=sa.Text()), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
         sa.Column('resolved_at', sa.DateTime(timezone=True), nullable=True),
         sa.Column('assigned_to', sa.String(), nullable=True),
@@ -36,7 +36,6 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['user_id'], ['users.clerk_id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_support_requests_id'), 'support_requests', ['id'], unique=False)
 
     # Create bug_reports table
     op.create_table('bug_reports',
@@ -52,7 +51,7 @@ def upgrade() -> None:
         sa.Column('status', sa.String(length=20), nullable=True),
         sa.Column('system_info', postgresql.JSON(astext_type=sa.Text()), nullable=True),
         sa.Column('include_screenshots', sa.Boolean(), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
         sa.Column('resolved_at', sa.DateTime(timezone=True), nullable=True),
         sa.Column('assigned_to', sa.String(), nullable=True),
@@ -62,7 +61,6 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['user_id'], ['users.clerk_id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_bug_reports_id'), 'bug_reports', ['id'], unique=False)
 
     # Create support_responses table
     op.create_table('support_responses',
@@ -72,25 +70,21 @@ def upgrade() -> None:
         sa.Column('responder_id', sa.String(), nullable=False),
         sa.Column('message', sa.Text(), nullable=False),
         sa.Column('is_internal', sa.Boolean(), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
         sa.ForeignKeyConstraint(['bug_report_id'], ['bug_reports.id'], ),
         sa.ForeignKeyConstraint(['responder_id'], ['users.clerk_id'], ),
         sa.ForeignKeyConstraint(['support_request_id'], ['support_requests.id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_support_responses_id'), 'support_responses', ['id'], unique=False)
 
 
 def downgrade() -> None:
     # Drop support_responses table
-    op.drop_index(op.f('ix_support_responses_id'), table_name='support_responses')
     op.drop_table('support_responses')
 
     # Drop bug_reports table
-    op.drop_index(op.f('ix_bug_reports_id'), table_name='bug_reports')
     op.drop_table('bug_reports')
 
     # Drop support_requests table
-    op.drop_index(op.f('ix_support_requests_id'), table_name='support_requests')
     op.drop_table('support_requests')
 
@@ -0,0 +1,37 @@
+"""Index conversation participants by user
+
+Revision ID: adde38f49395
+Revises: 2ace2b0bf39a
+Create Date: 2025-07-24 13:40:00.000000
+
+idx_participant_user_conversation puts user_id first, for the
+"conversations of user X" lookups. The existing
+idx_participant_conversation_user leads with conversation_id and cannot
+serve them.
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'adde38f49395'
+down_revision = '2ace2b0bf39a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY so participants stay writable while the index builds
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        op.create_index('idx_participant_user_conversation', 'conversation_participants',
+                        ['user_id', 'conversation_id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.execute("RESET statement_timeout")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_participant_user_conversation', table_name='conversation_participants',
+                      postgresql_concurrently=True, if_exists=True)
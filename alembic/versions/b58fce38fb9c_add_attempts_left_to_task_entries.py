@@ -17,11 +17,12 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Step 1: Add as nullable with server default
-    op.add_column('task_entries', sa.Column('attempts_left', sa.Integer(), server_default='3', nullable=True))
-    # Step 2: Set NOT NULL and remove server default
-    op.alter_column('task_entries', 'attempts_left', nullable=False, server_default=None)
-
+    # ADD COLUMN ... NOT NULL DEFAULT is metadata-only on Postgres 11+, so
+    # existing rows are never rewritten or rescanned to check NOT NULL
+    op.add_column('task_entries', sa.Column('attempts_left', sa.Integer(), server_default='3', nullable=False))
+    # The model sets attempts_left on insert; dropping the default only
+    # touches the catalog now that every row already has a value
+    op.alter_column('task_entries', 'attempts_left', server_default=None)
 
 def downgrade() -> None:
     op.drop_column('task_entries', 'attempts_left')
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""Convert support status, priority and severity columns to native enums
+
+Revision ID: b8e3f0a2c6d1
+Revises: 7c4e2d9b1a03
+Create Date: 2025-07-24 12:00:00.000000
+
+support_requests.status/priority and bug_reports.severity/status were
+created as VARCHAR(20). Low-cardinality categorical columns are cheaper as
+native enums: 4 bytes per value and integer comparisons, instead of a
+varlena string per row. The value sets match the *_OPTIONS lists in
+src/support/models.py. The service validates new values against them,
+but rows written before that could hold anything, so the upgrade first
+lists any out-of-set values and stops before changing the schema.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e3f0a2c6d1'
+down_revision = '7c4e2d9b1a03'
+branch_labels = None
+depends_on = None
+
+support_status = postgresql.ENUM('open', 'in_progress', 'resolved', 'closed',
+                                 name='support_status', create_type=False)
+support_priority = postgresql.ENUM('low', 'medium', 'high', 'critical',
+                                   name='support_priority', create_type=False)
+bug_severity = postgresql.ENUM('low', 'medium', 'high', 'critical',
+                               name='bug_severity', create_type=False)
+bug_status = postgresql.ENUM('open', 'investigating', 'confirmed', 'in_progress', 'resolved', 'closed',
+                             name='bug_status', create_type=False)
+ENUM_TYPES = (support_status, support_priority, bug_severity, bug_status)
+
+# (table, column, enum type) for every column converted below
+ENUM_COLUMNS = (
+    ('support_requests', 'status', support_status),
+    ('support_requests', 'priority', support_priority),
+    ('bug_reports', 'severity', bug_severity),
+    ('bug_reports', 'status', bug_status),
+)
+
+
+def check_enum_values(bind) -> None:
+    """Fail with the offending values if a cast to the enums would fail"""
+    problems = []
+    for table, column, enum_type in ENUM_COLUMNS:
+        bad = bind.execute(
+            sa.text(f"""
+                SELECT {column}, COUNT(*) FROM {table}
+                WHERE {column} IS NOT NULL AND {column} <> ALL(:allowed)
+                GROUP BY {column} ORDER BY {column}
+            """),
+            {"allowed": list(enum_type.enums)}
+        ).all()
+        problems.extend(f"{table}.{column} = {value!r} ({count} rows)" for value, count in bad)
+    if problems:
+        raise RuntimeError(
+            "Values outside the new enum types; fix these rows and rerun the upgrade:\n  "
+            + "\n  ".join(problems)
+        )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    check_enum_values(bind)
+    for enum_type in ENUM_TYPES:
+        enum_type.create(bind, checkfirst=True)
+
+    # One ALTER TABLE per table so each is locked (and rewritten) at most once
+    op.execute("""
+        ALTER TABLE support_requests
+            ALTER COLUMN status TYPE support_status USING status::support_status,
+            ALTER COLUMN priority TYPE support_priority USING priority::support_priority
+    """)
+    op.execute("""
+        ALTER TABLE bug_reports
+            ALTER COLUMN severity TYPE bug_severity USING severity::bug_severity,
+            ALTER COLUMN status TYPE bug_status USING status::bug_status
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE support_requests
+            ALTER COLUMN status TYPE VARCHAR(20) USING status::text,
+            ALTER COLUMN priority TYPE VARCHAR(20) USING priority::text
+    """)
+    op.execute("""
+        ALTER TABLE bug_reports
+            ALTER COLUMN severity TYPE VARCHAR(20) USING severity::text,
+            ALTER COLUMN status TYPE VARCHAR(20) USING status::text
+    """)
+
+    bind = op.get_bind()
+    for enum_type in ENUM_TYPES:
+        enum_type.drop(bind, checkfirst=True)
@@ -5,10 +5,11 @@ Revises: a1b2c3d4e5f6
 Create Date: 2024-12-19 10:00:00.000000
 
 """
+import os
+
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
-from sqlalchemy import inspect
 
 # revision identifiers, used by Alembic.
 revision = 'cf3d5b0ff921'
@@ -16,11 +17,17 @@ down_revision = 'a1b2c3d4e5f6'
 branch_labels = None
 depends_on = None
 
+# When set, indexes and unique constraints are left to the
+# build_deferred_indexes revision so bulk loads don't maintain them.
+DEFER_INDEXES = os.getenv('ALEMBIC_DEFER_INDEXES', 'false').lower() == 'true'
+
 
 def upgrade() -> None:
     # Check if device_tokens table already exists
-    inspector = inspect(op.get_bind())
-    if 'device_tokens' in inspector.get_table_names():
+    exists = op.get_bind().execute(
+        sa.text("SELECT to_regclass('public.device_tokens') IS NOT NULL")
+    ).scalar()
+    if exists:
         print("device_tokens table already exists, skipping creation")
         return
 
@@ -32,31 +39,34 @@ def upgrade() -> None:
         sa.Column('platform', sa.String(length=16), nullable=False),
         sa.Column('app_version', sa.String(length=32), nullable=True),
         sa.Column('system_version', sa.String(length=32), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
-        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
 
-    # Create indexes
-    op.create_index(op.f('ix_device_tokens_id'), 'device_tokens', ['id'], unique=False)
-    op.create_index(op.f('ix_device_tokens_device_token'), 'device_tokens', ['device_token'], unique=True)
+    if DEFER_INDEXES:
+        return
 
-    # Create unique constraint for user_id and device_token combination
-    op.create_unique_constraint('uq_user_device_token', 'device_tokens', ['user_id', 'device_token'])
+    # Build the unique indexes CONCURRENTLY so writers are never blocked
+    # while tokens are sorted, then attach the composite one as the
+    # constraint (a brief catalog-only change).
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        op.create_index('ix_device_tokens_device_token', 'device_tokens', ['device_token'], unique=True,
+                        postgresql_concurrently=True, if_not_exists=True)
+        # Unique constraint for user_id and device_token combination
+        op.create_index('uq_user_device_token', 'device_tokens', ['user_id', 'device_token'], unique=True,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.execute("ALTER TABLE device_tokens ADD CONSTRAINT uq_user_device_token UNIQUE USING INDEX uq_user_device_token")
+        op.execute("RESET statement_timeout")
 
 
 def downgrade() -> None:
-    # Check if device_tokens table exists before dropping
-    inspector = inspect(op.get_bind())
-    if 'device_tokens' not in inspector.get_table_names():
-        print("device_tokens table does not exist, skipping drop")
-        return
-
     # Drop indexes and constraints
-    op.drop_constraint('uq_user_device_token', 'device_tokens', type_='unique')
-    op.drop_index(op.f('ix_device_tokens_device_token'), table_name='device_tokens')
-    op.drop_index(op.f('ix_device_tokens_id'), table_name='device_tokens')
+    op.execute("ALTER TABLE IF EXISTS device_tokens DROP CONSTRAINT IF EXISTS uq_user_device_token")
+    op.drop_index('ix_device_tokens_device_token', table_name='device_tokens', if_exists=True)
 
     # Drop table
-    op.drop_table('device_tokens')
\ No newline at end of file
+    op.execute("DROP TABLE IF EXISTS device_tokens")
\ No newline at end of file
@@ -14,15 +14,40 @@ down_revision = '9dc0fb0958d8'
 branch_labels = None
 depends_on = None
 
+# Width of the id window backfilled per committed batch
+BACKFILL_CHUNK_SIZE = 10_000
+
 def upgrade() -> None:
+    conn = op.get_bind()
     # 1. Add the column as nullable
     op.add_column('posts', sa.Column('assigned_date', sa.Date(), nullable=True))
-    # 2. Populate for existing rows (fallback to created_at date)
-    op.execute("UPDATE posts SET assigned_date = DATE(created_at) WHERE assigned_date IS NULL")
-    # 3. Make the column non-nullable
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        # 2. Populate for existing rows (fallback to created_at date), one
+        #    short transaction per id window instead of one table-wide UPDATE
+        max_id = conn.execute(sa.text("SELECT COALESCE(MAX(id), 0) FROM posts")).scalar()
+        for lo in range(0, max_id + 1, BACKFILL_CHUNK_SIZE):
+            conn.execute(
+                sa.text("UPDATE posts SET assigned_date = DATE(created_at) "
+                        "WHERE id >= :lo AND id < :hi AND assigned_date IS NULL"),
+                {"lo": lo, "hi": lo + BACKFILL_CHUNK_SIZE},
+            )
+        # 3. Prove NOT NULL with a validated CHECK (ShareUpdateExclusiveLock only),
+        #    so SET NOT NULL below can skip its own full scan
+        op.execute("ALTER TABLE posts ADD CONSTRAINT posts_assigned_date_not_null "
+                   "CHECK (assigned_date IS NOT NULL) NOT VALID")
+        op.execute("ALTER TABLE posts VALIDATE CONSTRAINT posts_assigned_date_not_null")
+        # 4. Build the unique index without blocking writers
+        op.execute("CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS unique_user_habit_day_post "
+                   "ON posts (user_id, habit_id, assigned_date)")
+        op.execute("RESET statement_timeout")
+    # 5. Make the column non-nullable and attach the unique constraint; both
+    #    are catalog-only now
     op.alter_column('posts', 'assigned_date', nullable=False)
-    # 4. Add the unique constraint
-    op.create_unique_constraint('unique_user_habit_day_post', 'posts', ['user_id', 'habit_id', 'assigned_date'])
+    op.drop_constraint('posts_assigned_date_not_null', 'posts', type_='check')
+    op.execute("ALTER TABLE posts ADD CONSTRAINT unique_user_habit_day_post "
+               "UNIQUE USING INDEX unique_user_habit_day_post")
 
 def downgrade() -> None:
     op.drop_constraint('unique_user_habit_day_post', 'posts', type_='unique')
@@ -0,0 +1,47 @@
+"""Drop ix_*_id indexes that duplicate primary keys
+
+Revision ID: d400a66652c8
+Revises: adde38f49395
+Create Date: 2025-07-24 13:50:00.000000
+
+The chat, support and habits tables got a btree on id next to the
+primary key's own unique index. The copy serves no query and costs a
+write on every insert. Fresh installs never create them, so IF EXISTS
+makes this a no-op there.
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd400a66652c8'
+down_revision = 'adde38f49395'
+branch_labels = None
+depends_on = None
+
+
+ID_INDEXES = [
+    ('ix_conversations_id', 'conversations'),
+    ('ix_messages_id', 'messages'),
+    ('ix_conversation_participants_id', 'conversation_participants'),
+    ('ix_support_requests_id', 'support_requests'),
+    ('ix_bug_reports_id', 'bug_reports'),
+    ('ix_support_responses_id', 'support_responses'),
+    ('ix_habits_id', 'habits'),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY so the tables stay writable while the indexes go
+    with op.get_context().autocommit_block():
+        for name, table in ID_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        for name, table in ID_INDEXES:
+            op.create_index(name, table, ['id'], postgresql_concurrently=True, if_not_exists=True)
+        op.execute("RESET statement_timeout")
@@ -0,0 +1,44 @@
+"""Store support system_info as JSONB with a GIN index on bug reports
+
+Revision ID: e5c7a9d3b4f2
+Revises: b8e3f0a2c6d1
+Create Date: 2025-07-24 12:30:00.000000
+
+JSONB stores the parsed form, so key access no longer re-parses the text,
+and it can be GIN-indexed: idx_bug_reports_system_info_gin serves
+containment filters such as system_info @> '{"ios_version": "17.5"}'
+while triaging bugs.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c7a9d3b4f2'
+down_revision = 'b8e3f0a2c6d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE support_requests ALTER COLUMN system_info TYPE jsonb USING system_info::jsonb")
+    op.execute("ALTER TABLE bug_reports ALTER COLUMN system_info TYPE jsonb USING system_info::jsonb")
+
+    # Build the GIN index CONCURRENTLY so bug reports can still be filed meanwhile
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        op.create_index('idx_bug_reports_system_info_gin', 'bug_reports', ['system_info'],
+                        postgresql_using='gin', postgresql_ops={'system_info': 'jsonb_path_ops'},
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.execute("RESET statement_timeout")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_bug_reports_system_info_gin', table_name='bug_reports',
+                      postgresql_concurrently=True, if_exists=True)
+
+    op.execute("ALTER TABLE bug_reports ALTER COLUMN system_info TYPE json USING system_info::json")
+    op.execute("ALTER TABLE support_requests ALTER COLUMN system_info TYPE json USING system_info::json")
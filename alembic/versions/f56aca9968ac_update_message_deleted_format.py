@@ -15,30 +15,55 @@ down_revision = '9d009ee003f2'
 branch_labels = None
 depends_on = None
 
+# Rows rewritten per committed batch
+BATCH_SIZE = 5000
+
 
 def upgrade() -> None:
     # Update existing messages to use new format without brackets
     conn = op.get_bind()
     messages_exists = conn.execute(
-        sa.text("SELECT 1 FROM information_schema.tables WHERE table_name='messages'")
+        sa.text("SELECT to_regclass('public.messages') IS NOT NULL")
     ).scalar()
     if messages_exists:
-        op.execute("""
-            UPDATE messages
-            SET content = 'Message deleted'
-            WHERE content = '[Message deleted]'
-        """)
+        rewrite_content_in_batches(conn, '[Message deleted]', 'Message deleted')
 
 
 def downgrade() -> None:
     # Revert back to old format with brackets
     conn = op.get_bind()
     messages_exists = conn.execute(
-        sa.text("SELECT 1 FROM information_schema.tables WHERE table_name='messages'")
+        sa.text("SELECT to_regclass('public.messages') IS NOT NULL")
     ).scalar()
     if messages_exists:
-        op.execute("""
-            UPDATE messages
-            SET content = '[Message deleted]'
-            WHERE content = 'Message deleted'
-        """)
\ No newline at end of file
+        rewrite_content_in_batches(conn, 'Message deleted', '[Message deleted]')
+
+
+def rewrite_content_in_batches(conn, old: str, new: str) -> None:
+    """Replace messages.content == old with new, BATCH_SIZE rows per commit.
+
+    A temporary partial index on the matching rows turns every batch lookup
+    into an index scan instead of a sequential scan over all messages, and
+    committing per batch keeps row locks and WAL per transaction bounded.
+    The values are module constants, so inlining them in the DDL is safe.
+    """
+    with op.get_context().autocommit_block():
+        # Long steps run without statement_timeout (see alembic/env.py)
+        op.execute("SET statement_timeout = 0")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS tmp_messages_content_rewrite "
+            f"ON messages (id) WHERE content = '{old}'"
+        )
+        while True:
+            ids = conn.execute(
+                sa.text(f"SELECT id FROM messages WHERE content = '{old}' ORDER BY id LIMIT :limit"),
+                {"limit": BATCH_SIZE},
+            ).scalars().all()
+            if not ids:
+                break
+            conn.execute(
+                sa.text("UPDATE messages SET content = :new WHERE id = ANY(:ids)"),
+                {"new": new, "ids": ids},
+            )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS tmp_messages_content_rewrite")
+        op.execute("RESET statement_timeout")
\ No newline at end of file
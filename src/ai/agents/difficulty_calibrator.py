@@ -1,6 +1,7 @@
 import logging
-from typing import List, Dict, Any
-from datetime import datetime
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
+from datetime import datetime, timezone
 
 from ..gemini_client import get_gemini_client
 from ..schemas import DifficultyResponse, AIAgentResponse
@@ -8,6 +9,48 @@ from ..prompts.difficulty_prompts import get_difficulty_prompt, DIFFICULTY_PROMP
 
 logger = logging.getLogger(__name__)
 
+# System prompts never change at runtime, so resolve them once per language
+_SYSTEM_PROMPTS = {lang: prompts["system"] for lang, prompts in DIFFICULTY_PROMPTS.items()}
+
+_MOTIVATION_MAP = {"low": 0.3, "medium": 0.6, "high": 0.9}
+_ABILITY_MAP = {"hard": 0.3, "medium": 0.6, "easy": 0.9}
+_DIFFICULTY_MAP = {"easy": 1.0, "medium": 1.5, "hard": 2.0}
+
+# B=MAT scores for every (motivation, ability, base difficulty) combination
+_BMAT = {
+    (m, a, d): mv * av * dv
+    for m, mv in _MOTIVATION_MAP.items()
+    for a, av in _ABILITY_MAP.items()
+    for d, dv in _DIFFICULTY_MAP.items()
+}
+
+
+@lru_cache(maxsize=1024)
+def _cached_difficulty_prompt(
+    habit_name: str,
+    base_difficulty: str,
+    motivation_level: str,
+    ability_level: str,
+    completed: Tuple[bool, ...],
+    language: str,
+    streak: int,
+    recent_feedback: str
+) -> str:
+    """
+    Memoized get_difficulty_prompt. The prompt only reads the "completed"
+    flag of each performance entry, so that tuple is the hashable key.
+    """
+    return get_difficulty_prompt(
+        habit_name=habit_name,
+        base_difficulty=base_difficulty,
+        motivation_level=motivation_level,
+        ability_level=ability_level,
+        recent_performance=[{"completed": c} for c in completed],
+        language=language,
+        streak=streak,
+        recent_feedback=recent_feedback
+    )
+
 class DifficultyCalibratorAgent:
     """
     BJ Fogg's Difficulty Calibrator Agent
@@ -37,19 +80,19 @@ class DifficultyCalibratorAgent:
             logger.info(f"Calibrating difficulty for habit: {habit_name}")
 
             # Generate prompt
-            prompt = get_difficulty_prompt(
-                habit_name=habit_name,
-                base_difficulty=base_difficulty,
-                motivation_level=motivation_level,
-                ability_level=ability_level,
-                recent_performance=recent_performance or [],
-                language=language,
-                streak=streak,
-                recent_feedback=recent_feedback
+            prompt = _cached_difficulty_prompt(
+                habit_name,
+                base_difficulty,
+                motivation_level,
+                ability_level,
+                tuple(bool(p.get("completed", False)) for p in recent_performance or ()),
+                language,
+                streak,
+                recent_feedback or ""
             )
 
             # Get system prompt for language
-            system_prompt = DIFFICULTY_PROMPTS.get(language, DIFFICULTY_PROMPTS["en"])["system"]
+            system_prompt = _SYSTEM_PROMPTS.get(language) or _SYSTEM_PROMPTS["en"]
 
             # Generate structured response
             response = await self.gemini_client.generate_structured_response(
@@ -76,7 +119,7 @@ class DifficultyCalibratorAgent:
                     "ability_level": ability_level,
                     "streak": streak,
                     "recent_feedback": recent_feedback,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds")
                 }
             )
 
@@ -88,7 +131,7 @@ class DifficultyCalibratorAgent:
                 metadata={
                     "agent": "difficulty_calibrator",
                     "habit_name": habit_name,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds")
                 }
             )
 
@@ -109,23 +152,19 @@ class DifficultyCalibratorAgent:
                     metadata={"agent": "difficulty_calibrator"}
                 )
 
-            # Calculate success rates by difficulty
-            difficulty_stats = {}
+            # Calculate success rates by difficulty in a single pass
+            totals: Dict[Any, int] = {}
+            successes: Dict[Any, int] = {}
             for entry in performance_history:
                 difficulty = entry.get("difficulty", 1.0)
-                completed = entry.get("completed", False)
-
-                if difficulty not in difficulty_stats:
-                    difficulty_stats[difficulty] = {"total": 0, "completed": 0}
+                totals[difficulty] = totals.get(difficulty, 0) + 1
+                if entry.get("completed", False):
+                    successes[difficulty] = successes.get(difficulty, 0) + 1
 
-                difficulty_stats[difficulty]["total"] += 1
-                if completed:
-                    difficulty_stats[difficulty]["completed"] += 1
-
-            # Generate insights
+            # Generate insights (one iteration per distinct difficulty)
             insights = []
-            for difficulty, stats in difficulty_stats.items():
-                success_rate = stats["completed"] / stats["total"]
+            for difficulty, total in totals.items():
+                success_rate = successes.get(difficulty, 0) / total
                 if success_rate < 0.5:
                     insights.append(f"Difficulty {difficulty}: Low success rate ({success_rate:.1%}) - consider reducing")
                 elif success_rate > 0.8:
@@ -160,12 +199,13 @@ class DifficultyCalibratorAgent:
         """
         Calculate B=MAT score (Behavior = Motivation × Ability × Trigger)
         """
-        motivation_map = {"low": 0.3, "medium": 0.6, "high": 0.9}
-        ability_map = {"hard": 0.3, "medium": 0.6, "easy": 0.9}
-        difficulty_map = {"easy": 1.0, "medium": 1.5, "hard": 2.0}
-
-        motivation = motivation_map.get(motivation_level, 0.6)
-        ability = ability_map.get(ability_level, 0.6)
-        trigger = difficulty_map.get(base_difficulty, 1.5)
-
-        return motivation * ability * trigger
\ No newline at end of file
+        score = _BMAT.get((motivation_level, ability_level, base_difficulty))
+        if score is not None:
+            return score
+
+        # Unknown level: default just that factor, as before
+        return (
+            _MOTIVATION_MAP.get(motivation_level, 0.6)
+            * _ABILITY_MAP.get(ability_level, 0.6)
+            * _DIFFICULTY_MAP.get(base_difficulty, 1.5)
+        )
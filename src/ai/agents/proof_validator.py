@@ -1,8 +1,17 @@
+import os
 import logging
 import asyncio
-from typing import Optional, Dict, Any
-from datetime import datetime
+import hashlib
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Optional, Dict, Any, List, Tuple, Union, Callable, Awaitable
 
+from PIL import Image
+
+from ...services.media_service import media_service
+from ...services.redis_service import get_async_redis_client
 from ..gemini_client import get_gemini_client
 from ..schemas import TaskValidationResult
 
@@ -15,6 +24,249 @@ if not logger.hasHandlers():
     logger.addHandler(handler)
 logger.setLevel(logging.INFO)
 
+# Dedicated pool for proof-image decoding, resizing and hashing, so bursts
+# of photo validations can't starve the loop's default executor
+_IMAGE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PROOF_IMAGE_WORKERS", "4")),
+    thread_name_prefix="proof-image"
+)
+
+
+async def _run_in_image_pool(func: Callable[..., Any], *args: Any) -> Any:
+    return await asyncio.get_running_loop().run_in_executor(_IMAGE_EXECUTOR, func, *args)
+
+
+# Photos smaller than this are sent as-is; re-encoding wouldn't save much.
+# PROOF_IMAGE_COMPRESS=false sends every photo untouched.
+PROOF_IMAGE_COMPRESS = os.getenv("PROOF_IMAGE_COMPRESS", "true").lower() == "true"
+PROOF_IMAGE_COMPRESS_THRESHOLD = int(os.getenv("PROOF_IMAGE_COMPRESS_THRESHOLD", "200000"))
+
+# Static parts of the Gemini Vision prompt; only the task and its
+# requirements are spliced in per request
+PHOTO_PROMPT_PREFIX = (
+    "You are an AI proof validator for a habit tracking app. "
+    "The user submitted this image as proof for the following task:\n"
+)
+PHOTO_PROMPT_SUFFIX = (
+    "\n"
+    "Please answer:\n"
+    "1. Does the image clearly show the required action or object?\n"
+    "2. Is the image appropriate (not NSFW or offensive)?\n"
+    "Respond in JSON with: "
+    "is_valid (boolean), is_nsfw (boolean), confidence (float 0-1), feedback (string), reasoning (string, optional, max 2 sentences). "
+    "Be concise. Do not describe unrelated details."
+)
+
+# Re-asks after an unparseable vision reply before giving up
+VISION_PARSE_RETRIES = 2
+
+# Process-wide LRU of validation verdicts, keyed by a SHA-256 over every
+# input that shapes the prompt, so an identical resubmission skips Gemini
+_CACHE_MAX = 4096
+_VALIDATION_CACHE: "OrderedDict[str, TaskValidationResult]" = OrderedDict()
+
+
+def _cache_key(*parts: Union[str, bytes, None]) -> str:
+    """Hash the parts with an 8-byte length prefix each, so no two different
+    input tuples can produce the same byte stream"""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, bytes) else str(part or "").encode()
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def _cache_get(key: str) -> Optional[TaskValidationResult]:
+    # No awaits in the cache helpers, so they are atomic on the event loop
+    result = _VALIDATION_CACHE.get(key)
+    if result is None:
+        return None
+    _VALIDATION_CACHE.move_to_end(key)
+    return result.model_copy(deep=True)
+
+
+def _cache_put(key: str, result: TaskValidationResult) -> None:
+    _VALIDATION_CACHE[key] = result.model_copy(deep=True)
+    _VALIDATION_CACHE.move_to_end(key)
+    while len(_VALIDATION_CACHE) > _CACHE_MAX:
+        _VALIDATION_CACHE.popitem(last=False)
+
+
+# Verdicts are also shared through Redis so other workers and restarted
+# processes reuse them. Redis is best-effort: any error counts as a miss.
+_SHARED_CACHE_TTL = 86400
+
+
+async def _shared_cache_get(key: str) -> Optional[TaskValidationResult]:
+    try:
+        raw = await get_async_redis_client().get(f"pv:{key}")
+        if raw is None:
+            return None
+        return TaskValidationResult.model_validate_json(raw)
+    except Exception as e:
+        logger.warning(f"[ProofValidator] Shared cache read failed: {e}")
+        return None
+
+
+async def _shared_cache_put(key: str, result: TaskValidationResult) -> None:
+    try:
+        await get_async_redis_client().set(f"pv:{key}", result.model_dump_json(), ex=_SHARED_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"[ProofValidator] Shared cache write failed: {e}")
+
+
+# Near-duplicate photo index: per submitter and task, the 64-bit dHash of
+# each validated photo and the cache key of its verdict. A re-shot of the same
+# scene has different bytes but a hash within a few bits, so it can reuse the
+# verdict. Photos are only ever matched against the same user's earlier
+# proofs: a re-encoded or cropped copy of someone else's photo must go
+# through Gemini like any other new photo.
+_NEAR_DUP_MAX_DISTANCE = 5
+_NEAR_DUP_PER_TASK = 32
+_NEAR_DUP_CONFIDENCE_FACTOR = 0.9
+_NEAR_DUP_INDEX: "OrderedDict[str, List[Tuple[int, str]]]" = OrderedDict()
+
+
+def _dhash(image_data: bytes) -> Optional[int]:
+    """64-bit difference hash: brightness gradients of a 9x8 grayscale thumbnail"""
+    try:
+        with Image.open(BytesIO(image_data)) as image:
+            image.draft("L", (64, 64))  # JPEG decodes at reduced scale
+            # One byte per pixel in mode L; get_flattened_data needs Pillow 12.1
+            pixels = image.convert("L").resize((9, 8), Image.Resampling.LANCZOS).tobytes()
+    except Exception as e:
+        logger.warning(f"[ProofValidator] Could not hash proof image: {e}")
+        return None
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            bits = (bits << 1) | (left > pixels[row * 9 + col + 1])
+    return bits
+
+
+def _near_dup_get(task_key: str, image_hash: int) -> Optional[TaskValidationResult]:
+    entries = _NEAR_DUP_INDEX.get(task_key)
+    if not entries:
+        return None
+    for known_hash, cache_key in entries:
+        if (known_hash ^ image_hash).bit_count() <= _NEAR_DUP_MAX_DISTANCE:
+            result = _cache_get(cache_key)
+            if result is not None:
+                _NEAR_DUP_INDEX.move_to_end(task_key)
+                # Fuzzy match: slightly less certain than the original verdict
+                result.confidence *= _NEAR_DUP_CONFIDENCE_FACTOR
+                return result
+    return None
+
+
+def _near_dup_put(task_key: str, image_hash: int, cache_key: str) -> None:
+    # Drop entries whose verdicts have been evicted from the LRU, and any
+    # earlier entry for this same photo
+    entries = [
+        e for e in _NEAR_DUP_INDEX.get(task_key, [])
+        if e[1] in _VALIDATION_CACHE and e[1] != cache_key
+    ]
+    entries.append((image_hash, cache_key))
+    _NEAR_DUP_INDEX[task_key] = entries[-_NEAR_DUP_PER_TASK:]
+    _NEAR_DUP_INDEX.move_to_end(task_key)
+    while len(_NEAR_DUP_INDEX) > _CACHE_MAX:
+        _NEAR_DUP_INDEX.popitem(last=False)
+
+
+# Validations currently waiting on Gemini, by cache key. A concurrent
+# identical submission awaits the same call instead of issuing its own.
+_IN_FLIGHT: Dict[str, "asyncio.Future[TaskValidationResult]"] = {}
+
+
+async def _single_flight(
+    key: str,
+    make_call: Callable[[], Awaitable[TaskValidationResult]]
+) -> TaskValidationResult:
+    pending = _IN_FLIGHT.get(key)
+    if pending is None:
+        pending = asyncio.ensure_future(make_call())
+        _IN_FLIGHT[key] = pending
+        pending.add_done_callback(lambda _: _IN_FLIGHT.pop(key, None))
+    # Shielded so one cancelled caller doesn't cancel the shared call
+    result = await asyncio.shield(pending)
+    return result.model_copy(deep=True)
+
+
+# Everything that is identical across validations lives in the system prompt,
+# which is sent first, so requests share one static prefix and only the
+# task/proof fields differ
+VALIDATION_SYSTEM_PROMPT = """
+You are an AI proof validator for a habit tracking app based on BJ Fogg's Tiny Habits methodology.
+
+Your role is to:
+1. Validate task completion proofs fairly and encouragingly
+2. Focus on effort and progress over perfection
+3. Provide constructive feedback that motivates continued habit building
+4. Be lenient with tiny habits as the goal is consistency, not perfection
+5. Acknowledge any genuine attempt at the task
+
+Validation Instructions:
+1. Determine if the submitted proof demonstrates completion of the task
+2. Check if the proof meets the specific requirements stated
+3. Be encouraging but honest in your assessment
+4. Consider the intent and effort, not just perfection
+5. For tiny habits, be more lenient as the goal is building consistency
+6. If the proof is inappropriate (NSFW), set is_nsfw to true.
+
+Response Guidelines:
+- is_valid: true if proof demonstrates task completion, false otherwise
+- is_nsfw: true if the proof is inappropriate (NSFW), false otherwise
+- confidence: 0.0-1.0 based on clarity and completeness of proof
+- feedback: Encouraging message acknowledging effort and explaining validation
+- reasoning: Short explanation for the validation result (max 2 sentences)
+- suggestions: Helpful tips for better proof next time (if needed)
+
+Remember: The goal is to help users build sustainable habits through positive reinforcement.
+"""
+
+
+# Per-request prompt templates, filled with str.format
+VALIDATION_PROMPT_TEMPLATE = """
+Task Details:
+- Habit: {habit_name}
+- Task: {task_description}
+- Required Proof: {proof_requirements}
+
+Submitted Proof:
+- Type: {proof_type}
+- Content: {proof_content}
+- User: {user_name}
+
+Respond ONLY with a JSON object. Be concise.
+"""
+
+PHOTO_DESCRIPTION_PROMPT_TEMPLATE = """
+Validate this photo proof for task completion:
+
+Task: {task_description}
+Required: {proof_requirements}
+Photo shows: {image_description}
+User: {user_name}
+
+Analyze if the photo demonstrates task completion.
+Be encouraging and focus on effort shown.
+"""
+
+TEXT_PROOF_PROMPT_TEMPLATE = """
+Validate this text proof for task completion:
+
+Task: {task_description}
+Required: {proof_requirements}
+User wrote: "{text_content}"
+User: {user_name}
+
+Determine if the text indicates task completion.
+Be supportive and acknowledge effort.
+"""
+
+
 class ProofValidatorAgent:
     """
     AI Agent for validating task proof submissions
@@ -32,82 +284,152 @@ class ProofValidatorAgent:
         proof_content: str,
         user_name: str = "User",
         habit_name: str = "",
-        proof_file_data: Optional[bytes] = None
+        proof_file_data: Optional[bytes] = None,
+        submitter_id: Optional[Union[int, str]] = None
     ) -> TaskValidationResult:
         """
         Validate proof submission against task requirements
+
+        submitter_id identifies the user submitting the proof; without it a
+        photo can only reuse the verdict of a byte-identical photo, never that
+        of a near-duplicate.
         """
-        import json
+        if proof_type == "text":
+            blank = _blank_text_result(proof_content)
+            if blank is not None:
+                logger.info("Rejected empty text proof without calling Gemini")
+                return blank
+
+        image_digest = None
+        if proof_type == "photo" and proof_file_data:
+            # Hash the image bytes once; every cache layer and log line
+            # below keys off this digest
+            image_digest = hashlib.blake2b(proof_file_data, digest_size=16).hexdigest()
+            logger.info(f"[ProofValidator] Photo proof {image_digest} ({len(proof_file_data)} bytes)")
+            # The vision prompt only depends on the task and the image
+            cache_key = _cache_key("photo", task_description, proof_requirements, image_digest)
+        else:
+            cache_key = _cache_key(
+                "text", task_description, proof_requirements, proof_type, proof_content, user_name, habit_name
+            )
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"Returning cached {proof_type} proof validation result {image_digest or ''}")
+            return cached
+
+        image_hash = None
+        if image_digest is not None and submitter_id is not None:
+            task_key = _cache_key("photo", submitter_id, task_description, proof_requirements)
+            image_hash = await _run_in_image_pool(_dhash, proof_file_data)
+            if image_hash is not None:
+                near_dup = _near_dup_get(task_key, image_hash)
+                if near_dup is not None:
+                    logger.info(f"[ProofValidator] Returning verdict of a near-duplicate photo for {image_digest}")
+                    return near_dup
+
+        result = await _single_flight(cache_key, lambda: self._validate_proof_shared(
+            cache_key=cache_key,
+            task_description=task_description,
+            proof_requirements=proof_requirements,
+            proof_type=proof_type,
+            proof_content=proof_content,
+            user_name=user_name,
+            habit_name=habit_name,
+            proof_file_data=proof_file_data
+        ))
+        # Only real verdicts reach the cache, so only those are indexed
+        if image_hash is not None and cache_key in _VALIDATION_CACHE:
+            _near_dup_put(task_key, image_hash, cache_key)
+        return result
+
+    async def _validate_proof_shared(self, cache_key: str, **kwargs: Any) -> TaskValidationResult:
+        """Check the cross-worker cache before calling Gemini, and publish new verdicts to it"""
+        shared = await _shared_cache_get(cache_key)
+        if shared is not None:
+            logger.info("[ProofValidator] Returning verdict from shared cache")
+            _cache_put(cache_key, shared)
+            return shared
+        result = await self._validate_proof_uncached(cache_key=cache_key, **kwargs)
+        # Fallback results are never put in the local cache; only share real verdicts
+        if cache_key in _VALIDATION_CACHE:
+            await _shared_cache_put(cache_key, result)
+        return result
+
+    async def _validate_proof_uncached(
+        self,
+        cache_key: str,
+        task_description: str,
+        proof_requirements: str,
+        proof_type: str,
+        proof_content: str,
+        user_name: str,
+        habit_name: str,
+        proof_file_data: Optional[bytes]
+    ) -> TaskValidationResult:
+        """Run the Gemini validation and cache a successful verdict"""
         try:
             logger.info(f"Validating {proof_type} proof for task: {task_description[:50]}...")
             # --- Use Gemini Vision for photo proofs ---
             if proof_type == "photo" and proof_file_data:
-                import time
+                # Phone photos are several MB; a ~1024px JPEG uploads far
+                # faster and is all the vision model needs for a verdict
+                if PROOF_IMAGE_COMPRESS and len(proof_file_data) > PROOF_IMAGE_COMPRESS_THRESHOLD:
+                    compressed = await _run_in_image_pool(media_service.compress_proof_image, proof_file_data)
+                    if compressed:
+                        proof_file_data = compressed[0]
                 # --- Concise, safe prompt for validation ---
-                prompt = (
-                    "You are an AI proof validator for a habit tracking app. "
-                    "The user submitted this image as proof for the following task:\n"
-                    f"{task_description}\n"
-                    "Requirements: " + proof_requirements + "\n"
-                    "Please answer:\n"
-                    "1. Does the image clearly show the required action or object?\n"
-                    "2. Is the image appropriate (not NSFW or offensive)?\n"
-                    "Respond in JSON with: "
-                    "is_valid (boolean), is_nsfw (boolean), confidence (float 0-1), feedback (string), reasoning (string, optional, max 2 sentences). "
-                    "Be concise. Do not describe unrelated details."
+                base_prompt = "".join((
+                    PHOTO_PROMPT_PREFIX, task_description,
+                    "\nRequirements: ", proof_requirements, PHOTO_PROMPT_SUFFIX
+                ))
+                prompt = base_prompt
+                for attempt in range(VISION_PARSE_RETRIES + 1):
+                    logger.info(f"[ProofValidator] Starting Gemini Vision validation (attempt {attempt + 1})...")
+                    start_time = time.time()
+                    try:
+                        # The client caps concurrent Gemini requests; the 20s
+                        # budget includes any wait for one of its slots
+                        response_text = await asyncio.wait_for(
+                            self.gemini_client.analyze_image(
+                                proof_file_data, prompt, response_schema=TaskValidationResult
+                            ),
+                            timeout=20.0
+                        )
+                        elapsed = time.time() - start_time
+                        logger.info(f"[ProofValidator] Gemini Vision validation response: {response_text}")
+                    except asyncio.TimeoutError:
+                        logger.warning("[ProofValidator] Gemini Vision validation timed out after 20s!")
+                        return TaskValidationResult(
+                            is_valid=False,
+                            is_nsfw=False,
+                            confidence=0.0,
+                            feedback="AI validation timed out. Please try again or use a different image.",
+                            reasoning="AI did not respond in time."
+                        )
+                    try:
+                        # The reply is schema-constrained JSON, so parse and
+                        # validate it in one pass with the model's compiled validator
+                        validation = TaskValidationResult.model_validate_json(response_text)
+                        logger.info(f"[ProofValidator] Parsed validation result: valid={validation.is_valid}, nsfw={validation.is_nsfw}, confidence={validation.confidence}")
+                        _cache_put(cache_key, validation)
+                        return validation
+                    except Exception as e:
+                        logger.error(f"Failed to parse Gemini Vision response: {e}\nRaw response: {response_text}")
+                        if attempt == VISION_PARSE_RETRIES:
+                            break
+                        # Tell the model what was wrong and ask again
+                        prompt = (
+                            f"{base_prompt}\n\nYour previous JSON failed to parse: {str(e)[:300]}. "
+                            "Return ONLY valid JSON matching the schema."
+                        )
+                        await asyncio.sleep(1.0 * (attempt + 1))
+                return TaskValidationResult(
+                    is_valid=False,
+                    is_nsfw=False,
+                    confidence=0.0,
+                    feedback="Unable to validate proof image due to technical error.",
+                    reasoning="AI response could not be parsed."
                 )
-                logger.info(f"[ProofValidator] Starting Gemini Vision validation...")
-                start_time = time.time()
-                loop = asyncio.get_event_loop()
-                try:
-                    response_text = await asyncio.wait_for(
-                        loop.run_in_executor(None, self.gemini_client.analyze_image, proof_file_data, prompt),
-                        timeout=20.0
-                    )
-                    elapsed = time.time() - start_time
-                    logger.info(f"[ProofValidator] Gemini Vision validation response: {response_text}")
-                except asyncio.TimeoutError:
-                    logger.warning("[ProofValidator] Gemini Vision validation timed out after 20s!")
-                    return TaskValidationResult(
-                        is_valid=False,
-                        is_nsfw=False,
-                        confidence=0.0,
-                        feedback="AI validation timed out. Please try again or use a different image.",
-                        reasoning="AI did not respond in time."
-                    )
-                try:
-                    # Strip markdown code fences if present
-                    cleaned_response = response_text.strip()
-                    if cleaned_response.startswith("```json"):
-                        cleaned_response = cleaned_response.replace("```json", "").replace("```", "").strip()
-                    elif cleaned_response.startswith("```"):
-                        cleaned_response = cleaned_response.replace("```", "").strip()
-
-                    result = json.loads(cleaned_response)
-                    is_valid = bool(result.get("is_valid", False))
-                    is_nsfw = bool(result.get("is_nsfw", False))
-                    confidence = float(result.get("confidence", 0.0))
-                    feedback = str(result.get("feedback", "No feedback provided."))
-                    reasoning = result.get("reasoning")
-                    suggestions = result.get("suggestions", [])
-                    logger.info(f"[ProofValidator] Parsed validation result: valid={is_valid}, nsfw={is_nsfw}, confidence={confidence}")
-                    return TaskValidationResult(
-                        is_valid=is_valid,
-                        is_nsfw=is_nsfw,
-                        confidence=confidence,
-                        feedback=feedback,
-                        reasoning=reasoning,
-                        suggestions=suggestions
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to parse Gemini Vision response: {e}\nRaw response: {response_text}")
-                    return TaskValidationResult(
-                        is_valid=False,
-                        is_nsfw=False,
-                        confidence=0.0,
-                        feedback="Unable to validate proof image due to technical error.",
-                        reasoning="AI response could not be parsed."
-                    )
             # --- Fallback: text-only validation ---
             prompt = self._create_validation_prompt(
                 task_description=task_description,
@@ -125,6 +447,7 @@ class ProofValidatorAgent:
                 system_prompt=self._get_validation_system_prompt()
             )
             logger.info(f"Proof validation (text) completed: {'Valid' if response.is_valid else 'Invalid'} (confidence: {response.confidence:.2f})")
+            _cache_put(cache_key, response)
             return response
 
         except Exception as e:
@@ -146,25 +469,19 @@ class ProofValidatorAgent:
         user_name: str,
         habit_name: str
     ) -> str:
-        """Create the validation prompt for the AI"""
-        return f"""
-You are an AI proof validator for a habit tracking app.\n\nTask Details:\n- Habit: {habit_name}\n- Task: {task_description}\n- Required Proof: {proof_requirements}\n\nSubmitted Proof:\n- Type: {proof_type}\n- Content: {proof_content}\n- User: {user_name}\n\nValidation Instructions:\n1. Determine if the submitted proof demonstrates completion of the task\n2. Check if the proof meets the specific requirements stated\n3. Be encouraging but honest in your assessment\n4. Consider the intent and effort, not just perfection\n5. For tiny habits, be more lenient as the goal is building consistency\n6. If the proof is inappropriate (NSFW), set is_nsfw to true.\n\nResponse Guidelines:\n- is_valid: true if proof demonstrates task completion, false otherwise\n- is_nsfw: true if the proof is inappropriate (NSFW), false otherwise\n- confidence: 0.0-1.0 based on clarity and completeness of proof\n- feedback: Encouraging message acknowledging effort and explaining validation\n- reasoning: Short explanation for the validation result (max 2 sentences)\n- suggestions: Helpful tips for better proof next time (if needed)\n\nRespond ONLY with a JSON object. Be concise."
-        """
+        """Create the per-request part of the validation prompt"""
+        return VALIDATION_PROMPT_TEMPLATE.format(
+            habit_name=habit_name,
+            task_description=task_description,
+            proof_requirements=proof_requirements,
+            proof_type=proof_type,
+            proof_content=proof_content,
+            user_name=user_name
+        )
 
     def _get_validation_system_prompt(self) -> str:
         """Get the system prompt for validation"""
-        return """
-        You are an AI proof validator for a habit tracking app based on BJ Fogg's Tiny Habits methodology.
-
-        Your role is to:
-        1. Validate task completion proofs fairly and encouragingly
-        2. Focus on effort and progress over perfection
-        3. Provide constructive feedback that motivates continued habit building
-        4. Be lenient with tiny habits as the goal is consistency, not perfection
-        5. Acknowledge any genuine attempt at the task
-
-        Remember: The goal is to help users build sustainable habits through positive reinforcement.
-        """
+        return VALIDATION_SYSTEM_PROMPT
 
     async def validate_photo_proof(
         self,
@@ -175,17 +492,17 @@ You are an AI proof validator for a habit tracking app.\n\nTask Details:\n- Habi
     ) -> TaskValidationResult:
         """Specialized validation for photo proofs"""
 
-        prompt = f"""
-        Validate this photo proof for task completion:
+        prompt = PHOTO_DESCRIPTION_PROMPT_TEMPLATE.format(
+            task_description=task_description,
+            proof_requirements=proof_requirements,
+            image_description=image_description,
+            user_name=user_name
+        )
 
-        Task: {task_description}
-        Required: {proof_requirements}
-        Photo shows: {image_description}
-        User: {user_name}
-
-        Analyze if the photo demonstrates task completion.
-        Be encouraging and focus on effort shown.
-        """
+        cache_key = _cache_key("photo_description", prompt)
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
 
         try:
             response = await self.gemini_client.generate_structured_response(
@@ -193,6 +510,7 @@ You are an AI proof validator for a habit tracking app.\n\nTask Details:\n- Habi
                 response_schema=TaskValidationResult,
                 temperature=0.3
             )
+            _cache_put(cache_key, response)
             return response
         except Exception as e:
             logger.error(f"Error validating photo proof: {str(e)}")
@@ -211,18 +529,21 @@ You are an AI proof validator for a habit tracking app.\n\nTask Details:\n- Habi
         user_name: str = "User"
     ) -> TaskValidationResult:
         """Specialized validation for text proofs"""
+        blank = _blank_text_result(text_content)
+        if blank is not None:
+            return blank
 
-        prompt = f"""
-        Validate this text proof for task completion:
+        prompt = TEXT_PROOF_PROMPT_TEMPLATE.format(
+            task_description=task_description,
+            proof_requirements=proof_requirements,
+            text_content=text_content,
+            user_name=user_name
+        )
 
-        Task: {task_description}
-        Required: {proof_requirements}
-        User wrote: "{text_content}"
-        User: {user_name}
-
-        Determine if the text indicates task completion.
-        Be supportive and acknowledge effort.
-        """
+        cache_key = _cache_key("text_content", prompt)
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
 
         try:
             response = await self.gemini_client.generate_structured_response(
@@ -230,6 +551,7 @@ You are an AI proof validator for a habit tracking app.\n\nTask Details:\n- Habi
                 response_schema=TaskValidationResult,
                 temperature=0.3
             )
+            _cache_put(cache_key, response)
             return response
         except Exception as e:
             logger.error(f"Error validating text proof: {str(e)}")
@@ -241,6 +563,32 @@ You are an AI proof validator for a habit tracking app.\n\nTask Details:\n- Habi
             )
 
 
+def _blank_text_result(text: Optional[str]) -> Optional[TaskValidationResult]:
+    """Local verdict for text proofs with no letters or digits at all, which
+    no model would accept; anything else is left to Gemini"""
+    if any(ch.isalnum() for ch in text or ""):
+        return None
+    return TaskValidationResult(
+        is_valid=False,
+        is_nsfw=False,
+        confidence=1.0,
+        feedback="Your proof looks empty. Describe what you did in a few words and submit again!",
+        reasoning="The text proof contains no words.",
+        suggestions=["Write a short sentence about how you completed the task."]
+    )
+
+
+# Global validator instance
+proof_validator_agent: Optional[ProofValidatorAgent] = None
+
+def get_proof_validator_agent() -> ProofValidatorAgent:
+    """Get or create the proof validator agent instance"""
+    global proof_validator_agent
+    if proof_validator_agent is None:
+        proof_validator_agent = ProofValidatorAgent()
+    return proof_validator_agent
+
+
 # Convenience function for backward compatibility
 async def validate_proof(
     task_description: str,
@@ -249,12 +597,13 @@ async def validate_proof(
     proof_content: str,
     user_name: str = "User",
     habit_name: str = "",
-    proof_file_data: Optional[bytes] = None
+    proof_file_data: Optional[bytes] = None,
+    submitter_id: Optional[Union[int, str]] = None
 ) -> TaskValidationResult:
     """
     Convenience function to validate proof using the ProofValidatorAgent
     """
-    validator = ProofValidatorAgent()
+    validator = get_proof_validator_agent()
     return await validator.validate_proof(
         task_description=task_description,
         proof_requirements=proof_requirements,
@@ -262,5 +611,6 @@ async def validate_proof(
         proof_content=proof_content,
         user_name=user_name,
         habit_name=habit_name,
-        proof_file_data=proof_file_data
-    )
\ No newline at end of file
+        proof_file_data=proof_file_data,
+        submitter_id=submitter_id
+    )
@@ -1,6 +1,7 @@
 import logging
+import re
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
 from ..gemini_client import get_gemini_client
 from ..schemas import GeneratedTask, AIAgentResponse, TaskGenerationContext
@@ -8,6 +9,12 @@ from ..prompts.task_prompts import get_task_generation_prompt, TASK_TEMPLATES
 
 logger = logging.getLogger(__name__)
 
+_SYSTEM_PROMPTS = {lang: templates["system"] for lang, templates in TASK_TEMPLATES.items()}
+
+# Whole words only, so e.g. "trying" or "shoulder" aren't flagged
+_WILL_RE = re.compile(r"\bwill\b", re.IGNORECASE)
+_VAGUE_RE = re.compile(r"\b(?:try|maybe|might|could|should)\b", re.IGNORECASE)
+
 class TaskGeneratorAgent:
     """
     BJ Fogg's Task Generator Agent
@@ -46,7 +53,7 @@ class TaskGeneratorAgent:
             )
 
             # Get system prompt for language
-            system_prompt = TASK_TEMPLATES.get(context.user_language, TASK_TEMPLATES["en"])["system"]
+            system_prompt = _SYSTEM_PROMPTS.get(context.user_language) or _SYSTEM_PROMPTS["en"]
 
             # Generate structured response
             response = await self.gemini_client.generate_structured_response(
@@ -76,7 +83,7 @@ class TaskGeneratorAgent:
                     "difficulty": calibrated_difficulty,
                     "proof_style": context.proof_style,
                     "language": context.user_language,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds")
                 }
             )
 
@@ -88,7 +95,7 @@ class TaskGeneratorAgent:
                 metadata={
                     "agent": "task_generator",
                     "habit_name": context.habit_name,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds")
                 }
             )
 
@@ -213,7 +220,7 @@ class TaskGeneratorAgent:
         suggestions = []
 
         # Check if task is specific
-        if "will" not in task_description.lower():
+        if not _WILL_RE.search(task_description):
             issues.append("Task should use 'will' format")
             suggestions.append("Use format: 'After I [anchor], I will [specific action]'")
 
@@ -227,8 +234,7 @@ class TaskGeneratorAgent:
             suggestions.append("Consider breaking into smaller tasks")
 
         # Check for vague language
-        vague_words = ["try", "maybe", "might", "could", "should"]
-        if any(word in task_description.lower() for word in vague_words):
+        if _VAGUE_RE.search(task_description):
             issues.append("Task contains vague language")
             suggestions.append("Use specific, actionable language")
 
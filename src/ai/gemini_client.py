@@ -1,10 +1,20 @@
 import os
 import logging
 import json
-from typing import Optional, Type
+import random
+import asyncio
+import hashlib
+import time
+import importlib.util
+import httpx
+from collections import OrderedDict
+from functools import lru_cache
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple, Type
 from pydantic import BaseModel
 from google import genai
 from google.genai import types
+from google.genai.errors import APIError
 from google.genai.types import (
     GenerateContentConfig,
     LiveConnectConfig,
@@ -15,8 +25,275 @@ from google.genai.types import (
     PrebuiltVoiceConfig,
 )
 
+from .llm_cache import get_llm_cache
+
 logger = logging.getLogger(__name__)
 
+# orjson parses replies a few times faster when installed; it's optional
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+@lru_cache(maxsize=64)
+def _generation_config(
+    temperature: float,
+    max_tokens: int,
+    response_schema: Optional[Type[BaseModel]] = None
+) -> GenerateContentConfig:
+    """Request config; with a response_schema the model is held to emitting
+    JSON for that schema. Built once per combination and shared, so treat
+    the result as read-only."""
+    if response_schema is None:
+        return GenerateContentConfig(temperature=temperature, max_output_tokens=max_tokens)
+    return GenerateContentConfig(
+        temperature=temperature,
+        max_output_tokens=max_tokens,
+        response_mime_type="application/json",
+        response_schema=response_schema,
+    )
+
+
+# Rate limiting (429 RESOURCE_EXHAUSTED) and server errors (5xx) are
+# transient and worth retrying with exponential backoff; other client
+# errors fail at once
+_RETRY_ATTEMPTS = 4
+_RETRY_INITIAL_DELAY = 0.5
+_RETRY_MAX_DELAY = 8.0
+
+
+def _is_transient(error: APIError) -> bool:
+    return error.code == 429 or (error.code or 0) >= 500
+
+
+class GeminiUnavailableError(RuntimeError):
+    """Raised without calling Gemini while the circuit breaker is open"""
+
+
+class _CircuitBreaker:
+    """
+    Opens after fail_max consecutive transient failures, so callers fail
+    fast (and fall back) instead of queueing behind a provider outage.
+    After reset_timeout one trial call is let through; its outcome closes
+    the breaker or keeps it open for another period.
+    """
+
+    def __init__(self, fail_max: int = 10, reset_timeout: float = 30.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    def before_call(self) -> None:
+        if self._opened_at is None:
+            return
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            raise GeminiUnavailableError("Gemini is unavailable, circuit breaker is open")
+        # Half-open: let this call through and push the next trial back
+        self._opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._failures >= self.fail_max:
+            if self._opened_at is None:
+                logger.error(f"Gemini circuit breaker opened after {self._failures} failures")
+            self._opened_at = time.monotonic()
+
+
+_BREAKER = _CircuitBreaker()
+
+
+class _RateLimiter:
+    """Spaces request starts evenly so at most rpm begin per minute"""
+
+    def __init__(self, rpm: int):
+        self._interval = 60.0 / rpm
+        self._next_start = 0.0
+
+    async def acquire(self) -> float:
+        now = time.monotonic()
+        start = max(now, self._next_start)
+        # Reserve the slot before sleeping so concurrent callers queue up
+        self._next_start = start + self._interval
+        if start > now:
+            await asyncio.sleep(start - now)
+        return start - now
+
+
+# Caps on Gemini requests from this process: concurrent requests, and
+# optionally request starts per minute (0 disables the rate limit)
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "32"))
+GEMINI_MAX_RPM = int(os.getenv("GEMINI_MAX_RPM", "0"))
+
+
+def _retry_delay(error: APIError, attempt: int) -> float:
+    """Seconds to wait before retry number attempt+1; honors Retry-After"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        retry_after = float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        retry_after = None
+    if retry_after is not None:
+        return min(retry_after, _RETRY_MAX_DELAY)
+    backoff = min(_RETRY_INITIAL_DELAY * 2 ** attempt, _RETRY_MAX_DELAY)
+    return backoff + random.uniform(0, _RETRY_INITIAL_DELAY)
+
+
+# Calls currently in flight are shared, so concurrent duplicates make one
+# request. Finished replies are reused only for low-temperature calls, which
+# are close to deterministic; sampled replies (new tasks, suggestions) must
+# differ from call to call, so they are never cached.
+_DETERMINISTIC_TEMPERATURE = 0.3
+_DETERMINISTIC_TTL = 3600
+_IN_FLIGHT: Dict[str, "asyncio.Future[Any]"] = {}
+
+
+def _reply_cache_ttl(temperature: float) -> Optional[int]:
+    """Seconds to reuse a reply made at this temperature; None to not cache it"""
+    return _DETERMINISTIC_TTL if temperature <= _DETERMINISTIC_TEMPERATURE else None
+
+
+def _request_key(*parts: Any) -> str:
+    """SHA-256 hex digest of the length-prefixed parts of a request"""
+    h = hashlib.sha256()
+    for part in parts:
+        data = str(part).encode()
+        h.update(len(data).to_bytes(8, "big"))
+        h.update(data)
+    return h.hexdigest()
+
+
+def _copy_response(value: Any) -> Any:
+    # Callers may mutate the models they get back
+    return value.model_copy(deep=True) if isinstance(value, BaseModel) else value
+
+
+async def _coalesced(
+    key: str,
+    make_call: Callable[[], Awaitable[Any]],
+    cache_ttl: Optional[int] = None,
+    dump: Callable[[Any], str] = str,
+    load: Callable[[str], Any] = str
+) -> Any:
+    """Share the in-flight call for key; with cache_ttl, also reuse its
+    reply for that many seconds, across workers through Redis. Pass
+    cache_ttl only for low-temperature calls (see _reply_cache_ttl)."""
+    cache = get_llm_cache() if cache_ttl else None
+    if cache is not None:
+        raw = await cache.get(key)
+        if raw is not None:
+            try:
+                return load(raw)
+            except ValueError:
+                # Written for an older version of the schema; regenerate
+                pass
+
+    pending = _IN_FLIGHT.get(key)
+    if pending is None:
+        async def call_and_cache() -> Any:
+            value = await make_call()
+            if cache is not None:
+                await cache.set(key, dump(value), cache_ttl)
+            return value
+
+        pending = asyncio.ensure_future(call_and_cache())
+        _IN_FLIGHT[key] = pending
+        pending.add_done_callback(lambda _: _IN_FLIGHT.pop(key, None))
+    # Shielded so one cancelled caller doesn't cancel the shared call
+    return _copy_response(await asyncio.shield(pending))
+
+
+def _strip_code_fence(text: str) -> str:
+    """Strip surrounding whitespace and a ```/```json markdown fence, if any"""
+    text = text.strip()
+    if not text.startswith("```"):
+        return text
+    return text.removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+
+
+_json_decoder = json.JSONDecoder()
+
+
+def _extract_json_object(text: str) -> dict:
+    """Return the last top-level JSON object in a model reply.
+
+    Replies sometimes echo the schema or add prose around the object, so
+    each candidate '{' is decoded with raw_decode, which skips over nested
+    objects and braces inside strings.
+    """
+    # Usual case: the reply is exactly one object
+    try:
+        data = _json_loads(text)
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        return data
+
+    data = None
+    i = text.find("{")
+    while i != -1:
+        try:
+            obj, end = _json_decoder.raw_decode(text, i)
+        except json.JSONDecodeError:
+            i = text.find("{", i + 1)
+            continue
+        if isinstance(obj, dict):
+            data = obj
+        i = text.find("{", end)
+    if data is None:
+        # A reply cut off right before its closing brace
+        start = text.find("{")
+        data = json.loads(text[start:] + "}" if start != -1 else text)
+    return data
+
+
+def _image_mime_type(image_bytes: bytes) -> str:
+    """MIME type from the image's magic bytes, without decoding it"""
+    if image_bytes.startswith(b"\x89PNG"):
+        return "image/png"
+    if image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
+        return "image/webp"
+    if image_bytes[4:12] in (b"ftypheic", b"ftypheix", b"ftypmif1"):
+        return "image/heic"
+    # JPEG (FF D8) and anything unrecognised
+    return "image/jpeg"
+
+
+# Files API uploads are deleted after 48 hours; stop reusing them a bit
+# earlier. Only the most recent uploads are remembered.
+_UPLOADED_FILE_TTL = 47 * 3600
+_UPLOADED_FILES_MAX = 256
+
+
+def _file_sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+# Every request goes through this one client, so size its connection pool
+# for the concurrency we allow and keep connections alive between bursts
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=90)
+
+
+def _http_options() -> Optional[types.HttpOptions]:
+    # HTTP/2 needs the optional h2 package
+    async_client_args = {"limits": _HTTP_LIMITS, "http2": importlib.util.find_spec("h2") is not None}
+    try:
+        return types.HttpOptions(
+            client_args={"limits": _HTTP_LIMITS},
+            async_client_args=async_client_args
+        )
+    except (TypeError, ValueError):
+        # SDK releases without client args keep their default pool
+        return None
+
+
 class GeminiAIClient:
     """Client for interacting with Google Gemini via google-genai SDK"""
 
@@ -26,9 +303,111 @@ class GeminiAIClient:
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY environment variable is required")
         # VertexAI=False uses the direct GenAI endpoint
-        self.client = genai.Client(api_key=self.api_key, vertexai=False)
+        self.client = genai.Client(api_key=self.api_key, vertexai=False, http_options=_http_options())
+        self._sem = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+        self._rate_limiter = _RateLimiter(GEMINI_MAX_RPM) if GEMINI_MAX_RPM > 0 else None
+        self._stats = {"requests": 0, "rate_limited": 0, "queue_wait_seconds": 0.0}
+        # Content hash -> (expiry, Files API URI) of uploaded audio, oldest first
+        self._uploaded_files: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
         logger.info(f"Gemini client initialized with model: {self.model_name}")
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Request count, 429 responses and total time spent queueing for a slot"""
+        return dict(self._stats)
+
+    @asynccontextmanager
+    async def _slot(self):
+        """Hold one of the concurrent-request slots, paced by the rate limit.
+
+        This is the only concurrency cap on Gemini calls; callers must not
+        stack their own. Streams hold a slot only while the stream is opened,
+        so a slow consumer can't keep one busy.
+        """
+        queued_at = time.monotonic()
+        async with self._sem:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire()
+            self._stats["requests"] += 1
+            self._stats["queue_wait_seconds"] += time.monotonic() - queued_at
+            yield
+
+    async def warm_up(self) -> None:
+        """Open a pooled connection to the API ahead of the first real request"""
+        try:
+            await asyncio.wait_for(self.client.aio.models.get(model=self.model_name), timeout=10)
+        except Exception as e:
+            logger.warning(f"Gemini warm-up failed: {e}")
+
+    def _retry_or_raise(self, error: APIError, attempt: int) -> float:
+        """Delay before retrying a failed attempt; re-raises the error when
+        it isn't worth retrying, recording the outcome on the breaker"""
+        if error.code == 429:
+            self._stats["rate_limited"] += 1
+        if not _is_transient(error):
+            # The request itself was rejected; Gemini is up
+            _BREAKER.record_success()
+            raise error
+        if attempt == _RETRY_ATTEMPTS - 1:
+            _BREAKER.record_failure()
+            raise error
+        delay = _retry_delay(error, attempt)
+        logger.warning(f"Gemini returned {error.code}, retrying in {delay:.1f}s")
+        return delay
+
+    async def _generate(self, **kwargs):
+        """client.aio.models.generate_content, retried on rate limits and
+        server errors, behind the shared circuit breaker"""
+        _BREAKER.before_call()
+        for attempt in range(_RETRY_ATTEMPTS):
+            try:
+                async with self._slot():
+                    resp = await self.client.aio.models.generate_content(**kwargs)
+            except APIError as e:
+                await asyncio.sleep(self._retry_or_raise(e, attempt))
+            except httpx.TransportError:
+                _BREAKER.record_failure()
+                raise
+            else:
+                _BREAKER.record_success()
+                return resp
+
+    async def _generate_stream(self, **kwargs) -> AsyncIterator[str]:
+        """client.aio.models.generate_content_stream with the retries and
+        circuit breaker of _generate, yielding the reply text.
+
+        Only opening the stream (up to its first chunk) is retried: text
+        already passed on to the caller can't be taken back.
+        """
+        _BREAKER.before_call()
+        for attempt in range(_RETRY_ATTEMPTS):
+            try:
+                async with self._slot():
+                    stream = await self.client.aio.models.generate_content_stream(**kwargs)
+                    first = await anext(stream, None)
+            except APIError as e:
+                await asyncio.sleep(self._retry_or_raise(e, attempt))
+            except httpx.TransportError:
+                _BREAKER.record_failure()
+                raise
+            else:
+                break
+
+        try:
+            if first is not None and first.text:
+                yield first.text
+            async for chunk in stream:
+                if chunk.text:
+                    yield chunk.text
+        except APIError as e:
+            if _is_transient(e):
+                _BREAKER.record_failure()
+            raise
+        except httpx.TransportError:
+            _BREAKER.record_failure()
+            raise
+        else:
+            _BREAKER.record_success()
+
     async def generate_text(
         self,
         prompt: str,
@@ -38,19 +417,43 @@ class GeminiAIClient:
     ) -> str:
         """Generate text using Gemini model"""
         full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
-        resp = self.client.models.generate_content(
-                model=self.model_name,
-                contents=[full_prompt],
-            config=GenerateContentConfig(
-                    temperature=temperature,
-                    max_output_tokens=max_tokens,
-                )
-            )
+        key = _request_key("text", self.model_name, temperature, max_tokens, full_prompt)
+        return await _coalesced(
+            key,
+            lambda: self._generate_text(full_prompt, temperature, max_tokens),
+            cache_ttl=_reply_cache_ttl(temperature)
+        )
+
+    async def _generate_text(self, full_prompt: str, temperature: float, max_tokens: int) -> str:
+        resp = await self._generate(
+            model=self.model_name,
+            contents=[full_prompt],
+            config=_generation_config(temperature, max_tokens)
+        )
         if not getattr(resp, "text", None):
             logger.error("Empty response from Gemini API: %r", resp)
             raise ValueError("Received empty response from Gemini API")
         return resp.text
 
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 5000,
+        system_prompt: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Generate text using Gemini model, yielding it as it is produced.
+
+        Streamed replies bypass the response cache.
+        """
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        async for text in self._generate_stream(
+            model=self.model_name,
+            contents=[full_prompt],
+            config=_generation_config(temperature, max_tokens)
+        ):
+            yield text
+
     async def generate_structured_response(
         self,
         prompt: str,
@@ -60,82 +463,87 @@ class GeminiAIClient:
         system_prompt: Optional[str] = None
     ) -> BaseModel:
         """Generate structured response using a Pydantic schema"""
-        schema_json = response_schema.model_json_schema()
-        instructions = (
-            "IMPORTANT: Respond with ONLY a valid JSON object that matches this schema. "
-            "Do not include any prose or markdown.\n\n"
-            f"{schema_json}"
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        key = _request_key(
+            "structured", self.model_name, temperature, max_tokens,
+            response_schema.__module__, response_schema.__qualname__, full_prompt
         )
-        full_prompt = "\n\n".join(filter(None, [system_prompt, prompt, instructions]))
-        resp = self.client.models.generate_content(
+        return await _coalesced(
+            key,
+            lambda: self._generate_structured(full_prompt, response_schema, temperature, max_tokens),
+            cache_ttl=_reply_cache_ttl(temperature),
+            dump=lambda result: result.model_dump_json(),
+            load=response_schema.model_validate_json
+        )
+
+    async def _generate_structured(
+        self,
+        full_prompt: str,
+        response_schema: Type[BaseModel],
+        temperature: float,
+        max_tokens: int
+    ) -> BaseModel:
+        resp = await self._generate(
             model=self.model_name,
             contents=[full_prompt],
-            config=GenerateContentConfig(
-                temperature=temperature,
-                max_output_tokens=max_tokens,
-            )
+            config=_generation_config(temperature, max_tokens, response_schema)
         )
         text = resp.text or ""
-        # strip markdown code fences if present
-        if text.strip().startswith("```"):
-            text = text.strip().strip("```json").strip("```").strip()
-        # attempt to grab last JSON object
-        if text.count("{") > 1:
-            objs, cur, depth = [], "", 0
-            for c in text:
-                cur += c
-                if c == "{": depth += 1
-                if c == "}":
-                    depth -= 1
-                    if depth == 0:
-                        objs.append(cur)
-                        cur = ""
-            if objs:
-                text = objs[-1]
-        # close dangling braces
-        if text.count("{") > text.count("}"):
-            text += "}"
         try:
-            data = json.loads(text)
+            # Native structured output: the reply is JSON for the schema
+            return response_schema.model_validate_json(text)
+        except ValueError:
+            pass
+        # Fallback for a reply that still came back fenced or wrapped in prose
+        text = _strip_code_fence(text)
+        try:
+            data = _extract_json_object(text)
             return response_schema.model_validate(data)
         except Exception as e:
             logger.error("Failed to parse/validate JSON response: %s\nRaw: %s", e, text)
             raise
 
-    def analyze_image(
+    def _image_contents(
         self,
         image_bytes: bytes,
         prompt: str,
-        temperature: float = 0.3,
-        max_tokens: int = 500,  # Reduced from 1000 for faster responses
         system_prompt: Optional[str] = None
+    ) -> list:
+        """Build the multimodal parts for a vision request."""
+        contents = []
+
+        # Add system prompt if provided
+        if system_prompt:
+            contents.append(Part(text=system_prompt))
+
+        # Add the image data
+        contents.append(Part(inline_data={
+            "mime_type": _image_mime_type(image_bytes),
+            "data": image_bytes
+        }))
+
+        # Add the user prompt
+        contents.append(Part(text=prompt))
+        return contents
+
+    async def analyze_image(
+        self,
+        image_bytes: bytes,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 500,
+        system_prompt: Optional[str] = None,
+        response_schema: Optional[Type[BaseModel]] = None
     ) -> str:
-        """Analyze an image with Gemini Vision and return the response text."""
-        try:
-            # Use the correct google-genai SDK method for vision
-            contents = []
+        """Analyze an image with Gemini Vision and return the response text.
 
-            # Add system prompt if provided
-            if system_prompt:
-                contents.append(Part(text=system_prompt))
-
-            # Add the image data
-            contents.append(Part(inline_data={
-                "mime_type": "image/jpeg",  # Assuming JPEG, could be PNG
-                "data": image_bytes
-            }))
-
-            # Add the user prompt
-            contents.append(Part(text=prompt))
-
-            # Generate content using the client
-            resp = self.client.models.generate_content(
-                model="gemini-1.5-pro",  # Use the standard model, not vision-specific
-                contents=contents,
-                config=GenerateContentConfig(
-                    temperature=temperature,
-                    max_output_tokens=max_tokens,
-                )
+        Pass response_schema to get a JSON reply matching that model.
+        """
+        try:
+            resp = await self._generate(
+                model="gemini-1.5-pro",
+                contents=self._image_contents(image_bytes, prompt, system_prompt),
+                config=_generation_config(temperature, max_tokens, response_schema)
             )
 
             if not getattr(resp, "text", None):
@@ -194,16 +602,61 @@ class GeminiAIClient:
                     break
             return "".join(pieces)
 
+    def _cached_upload(self, digest: str) -> Optional[str]:
+        """Files API URI of an earlier, still live upload of this content"""
+        cached = self._uploaded_files.get(digest)
+        if cached is None:
+            return None
+        if cached[0] <= time.monotonic():
+            del self._uploaded_files[digest]
+            return None
+        return cached[1]
+
+    def _remember_upload(self, digest: str, file_uri: str) -> None:
+        now = time.monotonic()
+        self._uploaded_files[digest] = (now + _UPLOADED_FILE_TTL, file_uri)
+        self._uploaded_files.move_to_end(digest)
+        # Entries share one TTL, so insertion order is expiry order: drop
+        # expired uploads, then the oldest ones beyond the cap
+        while self._uploaded_files:
+            oldest_expiry = next(iter(self._uploaded_files.values()))[0]
+            if oldest_expiry > now and len(self._uploaded_files) <= _UPLOADED_FILES_MAX:
+                break
+            self._uploaded_files.popitem(last=False)
+
     async def analyze_audio_file(
         self,
         path: str,
         prompt: str,
-        **kwargs
+        temperature: float = 0.3,
+        max_tokens: int = 1000,
+        system_prompt: Optional[str] = None,
+        mime_type: str = "audio/wav"
     ) -> str:
-        """Convenience: read from disk then call analyze_audio."""
-        with open(path, "rb") as f:
-            b = f.read()
-        return await self.analyze_audio(b, prompt, **kwargs)
+        """
+        Analyze an audio file without loading it into memory: the file is
+        uploaded through the Files API once per content hash and referenced
+        by URI, so re-analyzing the same clip skips the upload.
+        """
+        digest = await asyncio.to_thread(_file_sha256, path)
+        file_uri = self._cached_upload(digest)
+        if file_uri is None:
+            uploaded = await self.client.aio.files.upload(file=path, config={"mime_type": mime_type})
+            file_uri = uploaded.uri
+            self._remember_upload(digest, file_uri)
+
+        contents = [Part(text=system_prompt)] if system_prompt else []
+        contents.append(Part(file_data=types.FileData(file_uri=file_uri, mime_type=mime_type)))
+        contents.append(Part(text=prompt))
+        resp = await self._generate(
+            model=self.model_name,
+            contents=contents,
+            config=_generation_config(temperature, max_tokens)
+        )
+        if not getattr(resp, "text", None):
+            logger.error("Empty response from Gemini audio analysis: %r", resp)
+            raise ValueError("Received empty response from Gemini API")
+        return resp.text
 
 
 # module‐level helpers
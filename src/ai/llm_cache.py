@@ -0,0 +1,97 @@
+import time
+import logging
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+from ..services.redis_service import get_async_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """
+    Two-tier cache of model replies: a per-process LRU in front of Redis.
+    Redis shares replies across workers and restarts; any Redis error is
+    treated as a miss, so an outage only costs the extra Gemini calls.
+    After a connection error Redis is skipped for redis_cooldown seconds,
+    so calls don't each wait out the socket timeouts while it is down.
+
+    Keys are SHA-256 hex digests of the full request (see
+    gemini_client._request_key), so a hit needs the exact same prompt.
+    Only store replies of low-temperature calls here: a sampled reply
+    would be handed to every later caller, on every worker.
+    """
+
+    def __init__(self, max_entries: int = 1024, local_ttl: int = 300, prefix: str = "llm:",
+                 redis_cooldown: float = 30.0):
+        self.max_entries = max_entries
+        self.local_ttl = local_ttl
+        self.prefix = prefix
+        self.redis_cooldown = redis_cooldown
+        self._local: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._redis_down_until = 0.0
+
+    def _redis_available(self) -> bool:
+        return time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, action: str, error: Exception) -> None:
+        if isinstance(error, (RedisConnectionError, RedisTimeoutError, OSError)):
+            self._redis_down_until = time.monotonic() + self.redis_cooldown
+            logger.warning(f"LLM cache {action} failed, skipping Redis for {self.redis_cooldown:.0f}s: {error}")
+        else:
+            logger.warning(f"LLM cache {action} failed: {error}")
+
+    def _get_local(self, key: str) -> Optional[str]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: str, ttl: int) -> None:
+        self._local[key] = (time.monotonic() + ttl, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[str]:
+        """Cached reply for key, or None"""
+        value = self._get_local(key)
+        if value is not None or not self._redis_available():
+            return value
+        try:
+            value = await get_async_redis_client().get(f"{self.prefix}{key}")
+        except Exception as e:
+            self._redis_failed("read", e)
+            return None
+        if value is not None:
+            # The remaining Redis TTL is unknown; keep the local copy briefly
+            self._set_local(key, value, self.local_ttl)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        """Store a reply for ttl seconds (locally for at most local_ttl)"""
+        self._set_local(key, value, min(ttl, self.local_ttl))
+        if not self._redis_available():
+            return
+        try:
+            await get_async_redis_client().set(f"{self.prefix}{key}", value, ex=ttl)
+        except Exception as e:
+            self._redis_failed("write", e)
+
+
+# Global LLM cache instance
+llm_cache: Optional[LLMCache] = None
+
+def get_llm_cache() -> LLMCache:
+    """Get or create the LLM reply cache"""
+    global llm_cache
+    if llm_cache is None:
+        llm_cache = LLMCache()
+    return llm_cache
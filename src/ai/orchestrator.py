@@ -1,7 +1,9 @@
+import json
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import AsyncIterator, List, Dict, Any, Optional
+from datetime import datetime, timezone
+from functools import partial
 
 from .gemini_client import get_gemini_client
 from .schemas import (
@@ -15,6 +17,22 @@ from .agents.task_generator import TaskGeneratorAgent
 
 logger = logging.getLogger(__name__)
 
+_utcnow = partial(datetime.now, timezone.utc)
+
+IMPROVEMENT_PROMPT_TEMPLATE = """Based on this performance data for the habit "{habit_name}":
+{performance_data}
+
+Provide 3-5 specific, actionable suggestions to improve this habit using BJ Fogg's Tiny Habits methodology.
+
+Focus on:
+1. Making the habit smaller/easier if success rate is low
+2. Better anchor habits
+3. Timing optimization
+4. Environment design
+5. Celebration and motivation
+
+Format as a list of specific suggestions."""
+
 class AIOrchestrator:
     """
     Orchestrates AI agents for task generation and management
@@ -88,7 +106,7 @@ class AIOrchestrator:
                     "pipeline_steps": ["difficulty_calibration", "task_generation"],
                     "habit_name": context.habit_name,
                     "final_difficulty": calibrated_difficulty,
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": _utcnow().isoformat(timespec="milliseconds"),
                     "agents_used": ["difficulty_calibrator", "task_generator"]
                 }
             )
@@ -101,10 +119,31 @@ class AIOrchestrator:
                 metadata={
                     "orchestrator": "ai_orchestrator",
                     "habit_name": context.habit_name,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": _utcnow().isoformat(timespec="milliseconds")
                 }
             )
 
+    async def generate_personalized_tasks(
+        self,
+        contexts: List[TaskGenerationContext],
+        max_concurrency: int = 10
+    ) -> List[AIAgentResponse]:
+        """
+        Generate personalized tasks for several habits concurrently.
+        Results are in the order of contexts; at most max_concurrency
+        pipelines run at once.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def generate(context: TaskGenerationContext) -> AIAgentResponse:
+            async with semaphore:
+                return await self.generate_personalized_task(
+                    context=context,
+                    recent_performance=context.recent_performance
+                )
+
+        return await asyncio.gather(*(generate(context) for context in contexts))
+
     async def generate_quick_task(
         self,
         habit_name: str,
@@ -165,17 +204,16 @@ class AIOrchestrator:
 
             # Generate performance summary
             if performance_history:
-                total_tasks = len(performance_history)
-                completed_tasks = sum(1 for p in performance_history if p.get("completed", False))
+                # Read each entry's completion once; sum() and list.index
+                # then run in C
+                completed = [bool(p.get("completed", False)) for p in performance_history]
+                total_tasks = len(completed)
+                completed_tasks = sum(completed)
                 success_rate = completed_tasks / total_tasks
 
-                # Calculate streak
-                current_streak = 0
-                for entry in reversed(performance_history):
-                    if entry.get("completed", False):
-                        current_streak += 1
-                    else:
-                        break
+                # Calculate streak: completed entries since the last miss
+                completed.reverse()
+                current_streak = completed.index(False) if False in completed else total_tasks
 
                 summary = {
                     "total_tasks": total_tasks,
@@ -200,7 +238,7 @@ class AIOrchestrator:
                     "orchestrator": "ai_orchestrator",
                     "analysis_type": "performance_trends",
                     "habit_name": habit_name,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": _utcnow().isoformat(timespec="milliseconds")
                 }
             )
 
@@ -236,21 +274,7 @@ class AIOrchestrator:
                 return performance_analysis
 
             # Generate improvement suggestions
-            prompt = f"""
-            Based on this performance data for the habit "{habit_name}":
-            {performance_analysis.data}
-
-            Provide 3-5 specific, actionable suggestions to improve this habit using BJ Fogg's Tiny Habits methodology.
-
-            Focus on:
-            1. Making the habit smaller/easier if success rate is low
-            2. Better anchor habits
-            3. Timing optimization
-            4. Environment design
-            5. Celebration and motivation
-
-            Format as a list of specific suggestions.
-            """
+            prompt = self._improvement_prompt(habit_name, performance_analysis.data)
 
             suggestions_response = await self.gemini_client.generate_text(
                 prompt=prompt,
@@ -268,7 +292,7 @@ class AIOrchestrator:
                     "orchestrator": "ai_orchestrator",
                     "analysis_type": "habit_improvements",
                     "habit_name": habit_name,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": _utcnow().isoformat(timespec="milliseconds")
                 }
             )
 
@@ -280,6 +304,32 @@ class AIOrchestrator:
                 metadata={"orchestrator": "ai_orchestrator"}
             )
 
+    async def suggest_habit_improvements_stream(
+        self,
+        habit_name: str,
+        performance_summary: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """
+        Stream improvement suggestions as they are generated, so the first
+        lines reach the user without waiting for the whole reply.
+        performance_summary is the data of a successful analyze_performance_trends
+        """
+        logger.info(f"Streaming improvement suggestions for habit: {habit_name}")
+        async for chunk in self.gemini_client.generate_text_stream(
+            prompt=self._improvement_prompt(habit_name, performance_summary),
+            temperature=0.7,
+            max_tokens=3000
+        ):
+            yield chunk
+
+    def _improvement_prompt(self, habit_name: str, performance_data: Dict[str, Any]) -> str:
+        # Sorted, compact JSON: fewer tokens than str(dict), and identical
+        # data always yields an identical prompt (and reply-cache key)
+        return IMPROVEMENT_PROMPT_TEMPLATE.format(
+            habit_name=habit_name,
+            performance_data=json.dumps(performance_data, sort_keys=True, separators=(",", ":"))
+        )
+
 # Global orchestrator instance
 ai_orchestrator: Optional[AIOrchestrator] = None
 
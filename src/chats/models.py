@@ -1,5 +1,5 @@
 from sqlalchemy import Boolean, Column, DateTime, Integer, String, ForeignKey, Text, Index
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 
 from ..database import Base
@@ -12,7 +12,7 @@ class Conversation(Base):
     """
     __tablename__ = "conversations"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     participant_1_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     participant_2_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -40,7 +40,7 @@ class Message(Base):
     """
     __tablename__ = "messages"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     conversation_id = Column(Integer, ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False)
     sender_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     content = Column(Text, nullable=False)
@@ -64,7 +64,7 @@ class Message(Base):
 
     # Constraints and indexes
     __table_args__ = (
-        Index('idx_message_conversation_created', 'conversation_id', 'created_at'),
+        Index('idx_message_conversation_created_desc', 'conversation_id', created_at.desc()),
         Index('idx_message_sender', 'sender_id'),
         Index('idx_message_status', 'status'),
         Index('idx_message_replied_to', 'replied_to_message_id'),
@@ -78,7 +78,7 @@ class ConversationParticipant(Base):
     """
     __tablename__ = "conversation_participants"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     conversation_id = Column(Integer, ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
@@ -102,6 +102,8 @@ class ConversationParticipant(Base):
     # Constraints and indexes
     __table_args__ = (
         Index('idx_participant_conversation_user', 'conversation_id', 'user_id'),
-        Index('idx_participant_online', 'is_online'),
-        Index('idx_participant_unread', 'unread_count'),
+        Index('idx_participant_user_conversation', 'user_id', 'conversation_id'),
+        Index('idx_participant_online_true', 'user_id', postgresql_where=text('is_online = true')),
+        Index('idx_participant_unread_positive', 'user_id', 'unread_count', postgresql_where=text('unread_count > 0')),
+        Index('idx_participant_last_read_message', 'last_read_message_id'),
     )
\ No newline at end of file
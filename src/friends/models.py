@@ -104,9 +104,10 @@ class BlockedUser(Base):
 
     # Constraints
     __table_args__ = (
+        # Also serves blocker_id-only lookups (leading column)
         UniqueConstraint('blocker_id', 'blocked_id', name='unique_blocked_user'),
-        Index('idx_blocked_user_blocker_id', 'blocker_id'),
-        Index('idx_blocked_user_blocked_id', 'blocked_id'),
+        # "Who blocked me" reads blocker_id straight from the index
+        Index('idx_blocked_user_blocked_id', 'blocked_id', postgresql_include=['blocker_id']),
     )
 
 
@@ -135,9 +136,8 @@ class UserReport(Base):
 
     # Constraints
     __table_args__ = (
-        Index('idx_user_report_reporter_id', 'reporter_id'),
-        Index('idx_user_report_reported_id', 'reported_id'),
-        Index('idx_user_report_status', 'status'),
-        Index('idx_user_report_category', 'category'),
-        Index('idx_user_report_created_at', 'created_at'),
+        Index('idx_user_report_reporter_reported', 'reporter_id', 'reported_id'),
+        Index('idx_user_report_reported_created', 'reported_id', 'created_at'),
+        # Admin moderation queue: filter by status, newest first
+        Index('idx_user_report_moderation', 'status', 'created_at'),
     )
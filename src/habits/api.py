@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import AsyncIterator, Optional
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 import json
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -14,6 +14,7 @@ from src.database import get_async_db, get_db
 from src.auth.dependencies import get_current_user
 from src.auth.models import User as UserModel
 from src.ai import get_ai_orchestrator, TaskGenerationContext
+from ..ai.gemini_client import GeminiUnavailableError
 from ..ai.agents.proof_validator import validate_proof
 from . import crud, schemas
 from .models import TaskEntry, Habit, TaskValidation
@@ -23,6 +24,9 @@ from src.posts.service import PostsService
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Ends a streamed plain-text body that was cut short by an error
+SUGGESTIONS_STREAM_ERROR_MARKER = "\n\n[error] Suggestions could not be completed, please try again."
+
 def _get_response_message(task_status: str, validation_result) -> str:
     """Get appropriate response message based on validation result"""
     if task_status == "completed":
@@ -298,6 +302,7 @@ async def submit_task_proof(
             user_name=current_user.username or "User",
             habit_name=habit.name,
             proof_file_data=file_data,
+            submitter_id=current_user.id,
         )
     except Exception as ai_err:
         validation_result = None
@@ -839,6 +844,69 @@ async def get_improvement_suggestions(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate suggestions: {str(e)}")
 
+async def _stream_suggestions(first_chunk: str, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Relay streamed suggestions; the 200 status is already sent, so a failure
+    part-way ends the body with an error marker instead"""
+    yield first_chunk
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except Exception as e:
+        logger.error(f"Improvement suggestions stream failed: {e}")
+        yield SUGGESTIONS_STREAM_ERROR_MARKER
+
+@router.get("/{habit_id}/improvement-suggestions/stream")
+async def stream_improvement_suggestions(
+    habit_id: int,
+    language: str = "en",
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    """
+    Stream AI-powered improvement suggestions as plain text while they are generated.
+    A body ending in SUGGESTIONS_STREAM_ERROR_MARKER was cut short by an error.
+    """
+    # Get habit details
+    habit = await crud.get_habit(db=db, habit_id=habit_id, user_id=current_user.id)
+    if not habit:
+        raise HTTPException(status_code=404, detail="Habit not found")
+
+    # Get performance history
+    performance_history = await crud.get_performance_history(
+        db=db,
+        user_id=current_user.id,
+        habit_id=habit_id,
+        days=30,
+        reference_date=date.today()
+    )
+
+    # Analyze before responding, so a failure still gets an error status
+    ai_orchestrator = get_ai_orchestrator()
+    analysis = await ai_orchestrator.analyze_performance_trends(
+        habit_name=habit.name,
+        performance_history=performance_history,
+        language=language
+    )
+    if not analysis.success:
+        raise HTTPException(status_code=500, detail=analysis.error)
+
+    # Likewise wait for the first chunk: errors opening the stream map to a status
+    chunks = ai_orchestrator.suggest_habit_improvements_stream(
+        habit_name=habit.name,
+        performance_summary=analysis.data
+    )
+    try:
+        first_chunk = await anext(chunks, "")
+    except GeminiUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate suggestions: {str(e)}")
+
+    return StreamingResponse(
+        _stream_suggestions(first_chunk, chunks),
+        media_type="text/plain; charset=utf-8"
+    )
+
 # --- Motivation/Ability Endpoints ---
 
 def _get_user_id(user: UserModel):
@@ -17,7 +17,7 @@ class AbilityLevel(str, Enum):
 class Habit(Base):
     __tablename__ = "habits"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
     description = Column(Text)
     frequency = Column(String, nullable=False)
@@ -83,7 +83,7 @@ class TaskEntry(Base):
         UniqueConstraint('user_id', 'habit_id', 'assigned_date', name='uq_user_habit_assigned_date'),
     )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     habit_id = Column(Integer, ForeignKey("habits.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
@@ -130,7 +130,7 @@ class TaskValidation(Base):
     """AI validation results for task proofs"""
     __tablename__ = "task_validations"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     task_entry_id = Column(Integer, ForeignKey("task_entries.id", ondelete="CASCADE"), nullable=False)
 
     # Validation details
@@ -18,6 +18,9 @@ logger = logging.getLogger("uvicorn.error")
 
 from . import models
 from .database import async_engine, get_async_db, init_db, close_db
+from .ai import get_ai_orchestrator
+from .ai.agents.proof_validator import get_proof_validator_agent
+from .ai.gemini_client import get_gemini_client
 from .auth.api import router as auth_router
 from .onboarding.api import router as onboarding_router
 from .webhooks.api import router as webhooks_router
@@ -29,9 +32,20 @@ from .support.router import router as support_router
 from src.notifications.api import router as notifications_router
 
 
+async def warm_up_ai():
+    """Set up the Gemini client and AI agents before the first request needs them"""
+    try:
+        get_ai_orchestrator()
+        get_proof_validator_agent()
+        await get_gemini_client().warm_up()
+    except Exception as e:
+        logger.warning(f"Skipping Gemini warm-up: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    await warm_up_ai()
     yield
     await close_db()
 
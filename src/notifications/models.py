@@ -4,7 +4,7 @@ from src.database import Base
 
 class DeviceToken(Base):
     __tablename__ = "device_tokens"
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     device_token = Column(String(256), unique=True, nullable=False, index=True)
     platform = Column(String(16), nullable=False, default="ios")
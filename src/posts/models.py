@@ -1,5 +1,5 @@
 from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text, ForeignKey, UniqueConstraint, Index, JSON, Date
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from enum import Enum as PyEnum
 
@@ -69,7 +69,7 @@ class Post(Base):
         Index('idx_post_privacy', 'privacy'),
         Index('idx_post_created_at', 'created_at'),
         Index('idx_post_habit_id', 'habit_id'),
-        Index('idx_post_habit_streak', 'habit_streak'),
+        Index('idx_post_habit_streak', 'habit_streak', postgresql_where=text('habit_streak > 0')),
     )
 
 
@@ -142,6 +142,17 @@ class MediaService:
             max_dimension=1080
         )
 
+    # MARK: - Proof Image Processing
+
+    def compress_proof_image(self, image_data: bytes) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        """Downscale a proof photo before AI validation; ~1024px is plenty for the verdict"""
+        return self.compress_image(
+            image_data=image_data,
+            max_file_size=1_000_000,  # 1MB
+            quality=80,
+            max_dimension=1024
+        )
+
     # MARK: - Image Validation
 
     def validate_image(self, image_data: bytes) -> Tuple[bool, str]:
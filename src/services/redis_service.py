@@ -1,4 +1,5 @@
 import redis
+import redis.asyncio as aioredis
 import json
 from typing import Optional, Any, Dict, List
 from pydantic_settings import BaseSettings
@@ -232,4 +233,22 @@ class RedisService:
             return {"status": "error", "error": str(e)}
 
 # Global Redis service instance
-redis_service = RedisService()
\ No newline at end of file
+redis_service = RedisService()
+
+_async_redis_client: Optional[aioredis.Redis] = None
+
+def get_async_redis_client() -> aioredis.Redis:
+    """Shared asyncio Redis client for code running on the event loop.
+
+    The client owns a connection pool and connects lazily, so this never
+    fails; callers handle connection errors per command.
+    """
+    global _async_redis_client
+    if _async_redis_client is None:
+        _async_redis_client = aioredis.from_url(
+            RedisSettings().redis_url,
+            decode_responses=True,
+            socket_connect_timeout=1,
+            socket_timeout=1
+        )
+    return _async_redis_client
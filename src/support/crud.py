@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, cast, Date
-from .models import WaitlistEmail, SupportRequest, BugReport
+from .models import WaitlistEmail, SupportRequest, BugReport, SupportStatus, BugStatus
 from sqlalchemy.exc import IntegrityError
 from typing import Optional
 
@@ -63,7 +63,7 @@ async def create_support_request(db: AsyncSession, user_id: Optional[str], categ
     await db.refresh(db_request)
     return db_request
 
-async def get_support_requests(db: AsyncSession, skip: int = 0, limit: int = 100, status: str = None) -> list[SupportRequest]:
+async def get_support_requests(db: AsyncSession, skip: int = 0, limit: int = 100, status: Optional[SupportStatus] = None) -> list[SupportRequest]:
     query = select(SupportRequest)
     if status:
         query = query.where(SupportRequest.status == status)
@@ -86,7 +86,7 @@ async def update_support_request(db: AsyncSession, request_id: int, **kwargs) ->
         await db.refresh(request)
     return request
 
-async def get_support_requests_count(db: AsyncSession, status: str = None) -> int:
+async def get_support_requests_count(db: AsyncSession, status: Optional[SupportStatus] = None) -> int:
     query = select(func.count(SupportRequest.id))
     if status:
         query = query.where(SupportRequest.status == status)
@@ -113,7 +113,7 @@ async def create_bug_report(db: AsyncSession, user_id: str, category: str, sever
     await db.refresh(db_report)
     return db_report
 
-async def get_bug_reports(db: AsyncSession, skip: int = 0, limit: int = 100, status: str = None) -> list[BugReport]:
+async def get_bug_reports(db: AsyncSession, skip: int = 0, limit: int = 100, status: Optional[BugStatus] = None) -> list[BugReport]:
     query = select(BugReport)
     if status:
         query = query.where(BugReport.status == status)
@@ -136,7 +136,7 @@ async def update_bug_report(db: AsyncSession, report_id: int, **kwargs) -> BugRe
         await db.refresh(report)
     return report
 
-async def get_bug_reports_count(db: AsyncSession, status: str = None) -> int:
+async def get_bug_reports_count(db: AsyncSession, status: Optional[BugStatus] = None) -> int:
     query = select(func.count(BugReport.id))
     if status:
         query = query.where(BugReport.status == status)
@@ -1,25 +1,52 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index, Enum
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Literal, get_args
 from datetime import datetime
 
 from ..database import Base
 
 
+# Enums for validation
+SUPPORT_CATEGORIES = [
+    "general", "technical", "billing", "feature", "bug", "account", "privacy"
+]
+
+BUG_CATEGORIES = [
+    "general", "ui", "performance", "crash", "authentication",
+    "habits", "friends", "chat", "notifications"
+]
+
+# Value sets of the native enum columns below; as query parameter types they
+# reject unknown values with a 422 instead of a database DataError
+SeverityLevel = Literal["low", "medium", "high", "critical"]
+SupportStatus = Literal["open", "in_progress", "resolved", "closed"]
+BugStatus = Literal["open", "investigating", "confirmed", "in_progress", "resolved", "closed"]
+SupportPriority = Literal["low", "medium", "high", "critical"]
+
+SEVERITY_LEVELS = list(get_args(SeverityLevel))
+
+STATUS_OPTIONS = list(get_args(SupportStatus))
+
+BUG_STATUS_OPTIONS = list(get_args(BugStatus))
+
+PRIORITY_OPTIONS = list(get_args(SupportPriority))
+
+
 # Database Models
 class SupportRequest(Base):
     __tablename__ = "support_requests"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(String, ForeignKey("users.clerk_id"), nullable=True)
     category = Column(String(50), nullable=False)
     subject = Column(String(255), nullable=False)
     message = Column(Text, nullable=False)
-    status = Column(String(20), default="open")
-    priority = Column(String(20), default="medium")
-    system_info = Column(JSON)
+    status = Column(Enum(*STATUS_OPTIONS, name="support_status"), default="open")
+    priority = Column(Enum(*PRIORITY_OPTIONS, name="support_priority"), default="medium")
+    system_info = Column(JSONB)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     resolved_at = Column(DateTime(timezone=True), nullable=True)
@@ -31,21 +58,25 @@ class SupportRequest(Base):
     assignee = relationship("User", foreign_keys=[assigned_to])
     responses = relationship("SupportResponse", back_populates="support_request", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index('idx_support_requests_assigned_to', 'assigned_to'),
+    )
+
 
 class BugReport(Base):
     __tablename__ = "bug_reports"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(String, ForeignKey("users.clerk_id"), nullable=False)
     category = Column(String(50), nullable=False)
-    severity = Column(String(20), nullable=False)
+    severity = Column(Enum(*SEVERITY_LEVELS, name="bug_severity"), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
     steps_to_reproduce = Column(Text, nullable=True)
     expected_behavior = Column(Text, nullable=True)
     actual_behavior = Column(Text, nullable=True)
-    status = Column(String(20), default="open")
-    system_info = Column(JSON)
+    status = Column(Enum(*BUG_STATUS_OPTIONS, name="bug_status"), default="open")
+    system_info = Column(JSONB)
     include_screenshots = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -59,11 +90,16 @@ class BugReport(Base):
     assignee = relationship("User", foreign_keys=[assigned_to])
     responses = relationship("SupportResponse", back_populates="bug_report", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index('idx_bug_reports_system_info_gin', 'system_info',
+              postgresql_using='gin', postgresql_ops={'system_info': 'jsonb_path_ops'}),
+    )
+
 
 class SupportResponse(Base):
     __tablename__ = "support_responses"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     support_request_id = Column(Integer, ForeignKey("support_requests.id"), nullable=True)
     bug_report_id = Column(Integer, ForeignKey("bug_reports.id"), nullable=True)
     responder_id = Column(String, ForeignKey("users.clerk_id"), nullable=False)
@@ -76,6 +112,12 @@ class SupportResponse(Base):
     support_request = relationship("SupportRequest", back_populates="responses")
     bug_report = relationship("BugReport", back_populates="responses")
 
+    __table_args__ = (
+        Index('idx_support_responses_support_request_id', 'support_request_id'),
+        Index('idx_support_responses_bug_report_id', 'bug_report_id'),
+        Index('idx_support_responses_responder', 'responder_id'),
+    )
+
 
 class WaitlistEmail(Base):
     __tablename__ = "waitlist_emails"
@@ -193,22 +235,3 @@ class SupportHistoryResponse(BaseModel):
 class BugReportHistoryResponse(BaseModel):
     bug_reports: List[BugReportResponse]
     count: int
-
-
-# Enums for validation
-SUPPORT_CATEGORIES = [
-    "general", "technical", "billing", "feature", "bug", "account", "privacy"
-]
-
-BUG_CATEGORIES = [
-    "general", "ui", "performance", "crash", "authentication",
-    "habits", "friends", "chat", "notifications"
-]
-
-SEVERITY_LEVELS = ["low", "medium", "high", "critical"]
-
-STATUS_OPTIONS = ["open", "in_progress", "resolved", "closed"]
-
-BUG_STATUS_OPTIONS = ["open", "investigating", "confirmed", "in_progress", "resolved", "closed"]
-
-PRIORITY_OPTIONS = ["low", "medium", "high", "critical"]
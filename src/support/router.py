@@ -7,6 +7,7 @@ from ..database import get_async_db
 from ..auth.dependencies import get_current_user
 from ..models import User
 from .models import (
+    SupportStatus, BugStatus, SeverityLevel,
     SupportRequestCreate, SupportRequestResponse, SupportRequestUpdate,
     BugReportCreate, BugReportResponse, BugReportUpdate,
     SupportResponseCreate, SupportResponseResponse,
@@ -227,7 +228,7 @@ async def add_bug_response(
 # Admin Endpoints
 @router.get("/admin/requests", response_model=List[SupportRequestResponse])
 async def get_all_support_requests(
-    status: Optional[str] = Query(None),
+    status: Optional[SupportStatus] = Query(None),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
     current_user: User = Depends(get_admin_user),
@@ -245,8 +246,8 @@ async def get_all_support_requests(
 
 @router.get("/admin/bug-reports", response_model=List[BugReportResponse])
 async def get_all_bug_reports(
-    status: Optional[str] = Query(None),
-    severity: Optional[str] = Query(None),
+    status: Optional[BugStatus] = Query(None),
+    severity: Optional[SeverityLevel] = Query(None),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
     current_user: User = Depends(get_admin_user),
@@ -327,7 +328,7 @@ async def create_support_request_admin(
 async def get_support_requests_admin(
     skip: int = 0,
     limit: int = 100,
-    status: str = None,
+    status: Optional[SupportStatus] = None,
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get paginated list of support requests (admin endpoint)"""
@@ -336,7 +337,7 @@ async def get_support_requests_admin(
 
 @router.get("/issues/count")
 async def get_support_requests_count_admin(
-    status: str = None,
+    status: Optional[SupportStatus] = None,
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get count of support requests (admin endpoint)"""
@@ -381,7 +382,7 @@ async def create_bug_report_admin(
 async def get_bug_reports_admin(
     skip: int = 0,
     limit: int = 100,
-    status: str = None,
+    status: Optional[BugStatus] = None,
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get paginated list of bug reports (admin endpoint)"""
@@ -390,7 +391,7 @@ async def get_bug_reports_admin(
 
 @router.get("/bug-reports/count")
 async def get_bug_reports_count_admin(
-    status: str = None,
+    status: Optional[BugStatus] = None,
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get count of bug reports (admin endpoint)"""
@@ -0,0 +1,4 @@
+import os
+
+# The AI modules read their settings at import time; tests never reach Gemini
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
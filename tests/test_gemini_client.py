@@ -0,0 +1,127 @@
+import json
+
+import pytest
+
+from src.ai import gemini_client
+from src.ai.gemini_client import (
+    GeminiUnavailableError,
+    _CircuitBreaker,
+    _extract_json_object,
+    _image_mime_type,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(gemini_client.time, "monotonic", clock)
+    return clock
+
+
+def test_breaker_opens_after_fail_max_failures(clock):
+    breaker = _CircuitBreaker(fail_max=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.record_failure()
+        breaker.before_call()
+    breaker.record_failure()
+    with pytest.raises(GeminiUnavailableError):
+        breaker.before_call()
+
+
+def test_breaker_success_resets_failure_count(clock):
+    breaker = _CircuitBreaker(fail_max=2, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.before_call()
+
+
+def test_breaker_half_open_lets_one_trial_through(clock):
+    breaker = _CircuitBreaker(fail_max=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 29
+    with pytest.raises(GeminiUnavailableError):
+        breaker.before_call()
+    clock.now += 1
+    breaker.before_call()
+    # The next trial waits for another reset_timeout
+    with pytest.raises(GeminiUnavailableError):
+        breaker.before_call()
+
+
+def test_breaker_closes_after_successful_trial(clock):
+    breaker = _CircuitBreaker(fail_max=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.before_call()
+    breaker.record_success()
+    breaker.before_call()
+    breaker.before_call()
+
+
+def test_breaker_reopens_after_failed_trial(clock):
+    breaker = _CircuitBreaker(fail_max=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.before_call()
+    breaker.record_failure()
+    clock.now += 29
+    with pytest.raises(GeminiUnavailableError):
+        breaker.before_call()
+
+
+def test_extract_json_object_plain():
+    assert _extract_json_object('{"a": 1}') == {"a": 1}
+
+
+def test_extract_json_object_takes_last_object_around_prose():
+    text = 'Schema: {"type": "object"}\nAnswer: {"a": {"b": "}"}, "c": [1, 2]} Thanks!'
+    assert _extract_json_object(text) == {"a": {"b": "}"}, "c": [1, 2]}
+
+
+def test_extract_json_object_skips_unbalanced_braces():
+    assert _extract_json_object('Use { carefully: {"ok": true}') == {"ok": True}
+
+
+def test_extract_json_object_repairs_missing_closing_brace():
+    assert _extract_json_object('{"a": 1') == {"a": 1}
+
+
+def test_extract_json_object_without_object_raises():
+    with pytest.raises(json.JSONDecodeError):
+        _extract_json_object("no json here")
+
+
+@pytest.mark.parametrize("data, mime_type", [
+    (b"\x89PNG\r\n\x1a\n" + b"\0" * 8, "image/png"),
+    (b"RIFF\x24\0\0\0WEBPVP8 ", "image/webp"),
+    (b"\0\0\0\x18ftypheic\0\0\0\0", "image/heic"),
+    (b"\0\0\0\x18ftypheix\0\0\0\0", "image/heic"),
+    (b"\0\0\0\x18ftypmif1\0\0\0\0", "image/heic"),
+    (b"\xff\xd8\xff\xe0\0\x10JFIF", "image/jpeg"),
+    (b"GIF89a", "image/jpeg"),
+    (b"", "image/jpeg"),
+])
+def test_image_mime_type(data, mime_type):
+    assert _image_mime_type(data) == mime_type
+
+
+def test_uploaded_files_are_capped_and_expire(monkeypatch, clock):
+    monkeypatch.setattr(gemini_client, "_UPLOADED_FILES_MAX", 2)
+    client = gemini_client.GeminiAIClient()
+    for digest in ("a", "b", "c"):
+        client._remember_upload(digest, f"uri-{digest}")
+    assert client._cached_upload("a") is None
+    assert client._cached_upload("c") == "uri-c"
+    clock.now += gemini_client._UPLOADED_FILE_TTL
+    assert client._cached_upload("c") is None
+    client._remember_upload("d", "uri-d")
+    assert list(client._uploaded_files) == ["d"]
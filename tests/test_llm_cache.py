@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.ai import llm_cache
+from src.ai.llm_cache import LLMCache
+
+
+class _FakeRedis:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = 0
+        self.data = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        self.calls += 1
+        if self.fail:
+            raise RedisConnectionError("redis is down")
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.calls += 1
+        if self.fail:
+            raise RedisConnectionError("redis is down")
+        self.data[key] = value
+        self.ttls[key] = ex
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(llm_cache.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(llm_cache, "get_async_redis_client", lambda: redis)
+    return redis
+
+
+def test_set_writes_through_to_redis(redis, clock):
+    cache = LLMCache(local_ttl=300)
+    asyncio.run(cache.set("k", "reply", ttl=3600))
+    assert redis.data == {"llm:k": "reply"}
+    assert redis.ttls == {"llm:k": 3600}
+    assert asyncio.run(cache.get("k")) == "reply"
+
+
+def test_local_copy_expires_and_falls_back_to_redis(redis, clock):
+    cache = LLMCache(local_ttl=300)
+    asyncio.run(cache.set("k", "reply", ttl=3600))
+    redis.data["llm:k"] = "from redis"
+    assert asyncio.run(cache.get("k")) == "reply"
+    clock.now += 300
+    assert asyncio.run(cache.get("k")) == "from redis"
+
+
+def test_local_ttl_never_exceeds_entry_ttl(redis, clock):
+    cache = LLMCache(local_ttl=300)
+    asyncio.run(cache.set("k", "reply", ttl=10))
+    del redis.data["llm:k"]  # Redis expired it
+    clock.now += 10
+    assert asyncio.run(cache.get("k")) is None
+
+
+def test_local_lru_evicts_least_recently_used(redis, clock):
+    cache = LLMCache(max_entries=2)
+    for key in ("a", "b"):
+        asyncio.run(cache.set(key, key, ttl=60))
+    asyncio.run(cache.get("a"))
+    asyncio.run(cache.set("c", "c", ttl=60))
+    redis.data.clear()
+    assert [asyncio.run(cache.get(key)) for key in ("a", "b", "c")] == ["a", None, "c"]
+
+
+def test_redis_errors_count_as_misses(monkeypatch, clock):
+    redis = _FakeRedis(fail=True)
+    monkeypatch.setattr(llm_cache, "get_async_redis_client", lambda: redis)
+    cache = LLMCache()
+    assert asyncio.run(cache.get("k")) is None
+    # The write still lands in the local tier
+    asyncio.run(cache.set("k", "reply", ttl=60))
+    assert asyncio.run(cache.get("k")) == "reply"
+
+
+def test_connection_error_skips_redis_until_cooldown_ends(monkeypatch, clock):
+    redis = _FakeRedis(fail=True)
+    monkeypatch.setattr(llm_cache, "get_async_redis_client", lambda: redis)
+    cache = LLMCache(redis_cooldown=30)
+    assert asyncio.run(cache.get("k")) is None
+    assert redis.calls == 1
+    asyncio.run(cache.set("k", "reply", ttl=60))
+    assert asyncio.run(cache.get("other")) is None
+    assert redis.calls == 1
+    assert asyncio.run(cache.get("k")) == "reply"
+
+    redis.fail = False
+    clock.now += 30
+    asyncio.run(cache.set("k2", "reply", ttl=60))
+    assert redis.data == {"llm:k2": "reply"}
@@ -0,0 +1,110 @@
+import asyncio
+import random
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from src.ai.agents import proof_validator
+from src.ai.agents.proof_validator import ProofValidatorAgent, _NEAR_DUP_MAX_DISTANCE, _dhash
+from src.ai.schemas import TaskValidationResult
+
+
+def _photo(seed: int, fmt: str = "PNG", quality: int = 95, flip: bool = False) -> bytes:
+    """A 256x256 image of random grey blocks; the same seed gives the same scene"""
+    rng = random.Random(seed)
+    image = Image.new("L", (256, 256))
+    for x in range(0, 256, 32):
+        for y in range(0, 256, 32):
+            image.paste(rng.randrange(256), (x, y, x + 32, y + 32))
+    if flip:
+        image = image.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+    out = BytesIO()
+    image.convert("RGB").save(out, fmt, quality=quality)
+    return out.getvalue()
+
+
+def _distance(a: bytes, b: bytes) -> int:
+    return (_dhash(a) ^ _dhash(b)).bit_count()
+
+
+def test_dhash_is_stable_across_reencoding():
+    original = _photo(1)
+    assert _distance(original, original) == 0
+    assert _distance(original, _photo(1, "JPEG", quality=60)) <= _NEAR_DUP_MAX_DISTANCE
+
+
+def test_dhash_separates_different_photos():
+    original = _photo(1)
+    assert _distance(original, _photo(2)) > _NEAR_DUP_MAX_DISTANCE
+    assert _distance(original, _photo(1, flip=True)) > _NEAR_DUP_MAX_DISTANCE
+
+
+def test_dhash_of_unreadable_bytes_is_none():
+    assert _dhash(b"not an image") is None
+
+
+class _FakeGeminiClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def analyze_image(self, image_bytes, prompt, **kwargs):
+        self.calls += 1
+        return TaskValidationResult(
+            is_valid=True, is_nsfw=False, confidence=0.8, feedback="Looks good"
+        ).model_dump_json()
+
+
+@pytest.fixture
+def validator(monkeypatch):
+    monkeypatch.setattr(proof_validator, "_VALIDATION_CACHE", type(proof_validator._VALIDATION_CACHE)())
+    monkeypatch.setattr(proof_validator, "_NEAR_DUP_INDEX", type(proof_validator._NEAR_DUP_INDEX)())
+
+    async def shared_get(key):
+        return None
+
+    async def shared_put(key, result):
+        pass
+
+    monkeypatch.setattr(proof_validator, "_shared_cache_get", shared_get)
+    monkeypatch.setattr(proof_validator, "_shared_cache_put", shared_put)
+    agent = ProofValidatorAgent.__new__(ProofValidatorAgent)
+    agent.gemini_client = _FakeGeminiClient()
+    return agent
+
+
+def _validate(agent: ProofValidatorAgent, image: bytes, submitter_id) -> TaskValidationResult:
+    return asyncio.run(agent.validate_proof(
+        task_description="Drink a glass of water",
+        proof_requirements="Photo of the glass",
+        proof_type="photo",
+        proof_content="",
+        proof_file_data=image,
+        submitter_id=submitter_id
+    ))
+
+
+def test_near_duplicate_reuses_own_verdict(validator):
+    _validate(validator, _photo(1), submitter_id=1)
+    result = _validate(validator, _photo(1, "JPEG", quality=60), submitter_id=1)
+    assert validator.gemini_client.calls == 1
+    assert result.is_valid
+    assert result.confidence == pytest.approx(0.8 * proof_validator._NEAR_DUP_CONFIDENCE_FACTOR)
+
+
+def test_near_duplicate_of_another_users_photo_is_validated(validator):
+    _validate(validator, _photo(1), submitter_id=1)
+    _validate(validator, _photo(1, "JPEG", quality=60), submitter_id=2)
+    assert validator.gemini_client.calls == 2
+
+
+def test_near_duplicate_needs_a_submitter(validator):
+    _validate(validator, _photo(1), submitter_id=None)
+    _validate(validator, _photo(1, "JPEG", quality=60), submitter_id=None)
+    assert validator.gemini_client.calls == 2
+
+
+def test_different_photo_is_validated(validator):
+    _validate(validator, _photo(1), submitter_id=1)
+    _validate(validator, _photo(2), submitter_id=1)
+    assert validator.gemini_client.calls == 2